@@ -0,0 +1,67 @@
+﻿using Microsoft.EntityFrameworkCore.Migrations;
+
+#nullable disable
+
+namespace Infrastructure.Migrations
+{
+    /// <summary>
+    /// Notifies the AI team generator on the employee_match_changed channel
+    /// whenever data that affects an employee's match profile changes, so its
+    /// in-memory candidate index can re-read only those employees.
+    /// </summary>
+    public partial class EmployeeMatchChangeNotifications : Migration
+    {
+        private static readonly string[] EmployeeTables =
+        {
+            "employee_profiles",
+            "employee_specialized_roles",
+            "employee_technologies",
+            "personal_interests",
+            "employee_languages",
+            "user_privacy_consents",
+        };
+
+        /// <inheritdoc />
+        protected override void Up(MigrationBuilder migrationBuilder)
+        {
+            migrationBuilder.Sql(@"
+CREATE OR REPLACE FUNCTION public.notify_employee_match_changed() RETURNS trigger AS $$
+DECLARE
+  rec record;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    rec := OLD;
+  ELSE
+    rec := NEW;
+  END IF;
+  IF TG_TABLE_NAME = 'employee_profiles' THEN
+    PERFORM pg_notify('employee_match_changed', 'employee:' || rec.id);
+  ELSIF TG_TABLE_NAME = 'user_privacy_consents' THEN
+    PERFORM pg_notify('employee_match_changed', 'user:' || rec.user_id);
+  ELSE
+    PERFORM pg_notify('employee_match_changed', 'employee:' || rec.employee_profile_id);
+  END IF;
+  RETURN NULL;
+END
+$$ LANGUAGE plpgsql;");
+
+            foreach (var table in EmployeeTables)
+            {
+                migrationBuilder.Sql(
+                    $"CREATE TRIGGER employee_match_changed AFTER INSERT OR UPDATE OR DELETE ON public.{table} " +
+                    "FOR EACH ROW EXECUTE FUNCTION public.notify_employee_match_changed();");
+            }
+        }
+
+        /// <inheritdoc />
+        protected override void Down(MigrationBuilder migrationBuilder)
+        {
+            foreach (var table in EmployeeTables)
+            {
+                migrationBuilder.Sql($"DROP TRIGGER IF EXISTS employee_match_changed ON public.{table};");
+            }
+
+            migrationBuilder.Sql("DROP FUNCTION IF EXISTS public.notify_employee_match_changed();");
+        }
+    }
+}
@@ -0,0 +1,78 @@
+﻿using Microsoft.EntityFrameworkCore.Migrations;
+
+#nullable disable
+
+namespace Infrastructure.Migrations
+{
+    /// <summary>
+    /// Pre-aggregated match profile read by the AI team generator when its
+    /// MATCH_PROFILE_ENABLED setting is on. The SELECT mirrors
+    /// MATCH_PROFILE_SELECT in the service's team_db_service.py.
+    /// </summary>
+    public partial class EmployeeMatchProfile : Migration
+    {
+        /// <inheritdoc />
+        protected override void Up(MigrationBuilder migrationBuilder)
+        {
+            migrationBuilder.Sql(@"
+CREATE MATERIALIZED VIEW public.employee_match_profile AS
+SELECT
+    ep.id AS employee_id,
+    coalesce(esr.specialized_role_id, '00000000-0000-0000-0000-000000000000'::uuid) AS role_key,
+    ep.user_id,
+    ep.first_name,
+    ep.last_name,
+    ep.first_name || ' ' || ep.last_name AS name,
+    sr.name AS role,
+    ta.name AS technical_area,
+    esr.level AS role_level,
+    esr.years_experience,
+    ep.sfia_level_general AS sfia_level,
+    ep.mbti,
+    ep.timezone,
+    ep.country,
+    ep.availability,
+    ep.verification_status,
+    coalesce(tech.names, '{}'::text[]) AS technologies,
+    coalesce(interest.names, '{}'::text[]) AS interests,
+    coalesce(lang.names, '{}'::text[]) AS languages
+FROM public.employee_profiles ep
+LEFT JOIN public.employee_specialized_roles esr ON esr.employee_profile_id = ep.id
+LEFT JOIN public.specialized_roles sr ON sr.id = esr.specialized_role_id
+LEFT JOIN public.technical_areas ta ON ta.id = sr.technical_area_id
+LEFT JOIN LATERAL (
+    SELECT array_agg(DISTINCT t.name::text) AS names
+    FROM public.employee_technologies et
+    JOIN public.technologies t ON t.id = et.technology_id
+    WHERE et.employee_profile_id = ep.id
+) tech ON true
+LEFT JOIN LATERAL (
+    SELECT array_agg(DISTINCT pi.name::text) AS names
+    FROM public.personal_interests pi
+    WHERE pi.employee_profile_id = ep.id
+) interest ON true
+LEFT JOIN LATERAL (
+    SELECT array_agg(DISTINCT el.language::text) AS names
+    FROM public.employee_languages el
+    WHERE el.employee_profile_id = ep.id
+) lang ON true
+WITH DATA;");
+
+            migrationBuilder.Sql(
+                "CREATE UNIQUE INDEX employee_match_profile_key ON public.employee_match_profile (employee_id, role_key);");
+            migrationBuilder.Sql(
+                "CREATE INDEX employee_match_profile_generation ON public.employee_match_profile " +
+                "(verification_status, availability, sfia_level DESC);");
+            migrationBuilder.Sql(
+                "CREATE INDEX employee_match_profile_role ON public.employee_match_profile (role, technical_area, role_level);");
+            migrationBuilder.Sql(
+                "CREATE INDEX employee_match_profile_technologies ON public.employee_match_profile USING gin (technologies);");
+        }
+
+        /// <inheritdoc />
+        protected override void Down(MigrationBuilder migrationBuilder)
+        {
+            migrationBuilder.Sql("DROP MATERIALIZED VIEW IF EXISTS public.employee_match_profile;");
+        }
+    }
+}
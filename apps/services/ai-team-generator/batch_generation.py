@@ -0,0 +1,89 @@
+"""
+Helpers for /generate-teams/batch.
+
+The batch reads one shared candidate pool per availability value (the
+union of every request's filters), then narrows it per request in memory
+with the same rules as the generation query; a request the shared pool
+leaves short is topped up with its own query. Teams are filled one at a
+time, scarcest first, and each person picked is removed from the pool of
+the teams that follow so no one is assigned twice.
+"""
+from team_db_service import parse_level, split_areas
+
+
+def requirement_tuples(requirements):
+    """(role, area, level) tuples as the generation query matches them."""
+    tuples = set()
+    for req in requirements:
+        level = parse_level(req.get("Level"))
+        if not (req.get("Role") and req.get("Area") and level):
+            continue
+        for area in split_areas(req.get("Area")):
+            tuples.add((req["Role"], area, level))
+    return tuples
+
+
+def union_fetch_groups(requests):
+    """
+    Groups the requests by availability and returns, per group, the
+    arguments of a single get_generation_candidates call that covers them
+    all. A filter is dropped for the group as soon as one request does not
+    use it.
+    """
+    groups = {}
+    for position, request in enumerate(requests):
+        requirements = [req.model_dump(by_alias=True) for req in request.requirements]
+        group = groups.setdefault(
+            request.availability,
+            {"positions": [], "requirements": [], "technologies": set(), "min_sfia_level": request.sfia_level,
+             "unfiltered_requirements": False, "unfiltered_technologies": False},
+        )
+        group["positions"].append(position)
+        if requirement_tuples(requirements):
+            group["requirements"].extend(requirements)
+        else:
+            group["unfiltered_requirements"] = True
+        if request.technologies:
+            group["technologies"].update(request.technologies)
+        else:
+            group["unfiltered_technologies"] = True
+        if group["min_sfia_level"] is not None and request.sfia_level is not None:
+            group["min_sfia_level"] = min(group["min_sfia_level"], request.sfia_level)
+        else:
+            group["min_sfia_level"] = None
+
+    return {
+        availability: {
+            "positions": group["positions"],
+            "requirements": [] if group["unfiltered_requirements"] else group["requirements"],
+            "technologies": [] if group["unfiltered_technologies"] else sorted(group["technologies"]),
+            "min_sfia_level": group["min_sfia_level"],
+        }
+        for availability, group in groups.items()
+    }
+
+
+def matches_request(row, request, tuples):
+    """Whether a row of the shared pool passes one request's generation filters."""
+    if request.sfia_level is not None and (row.get("sfia_level") is None or row["sfia_level"] < request.sfia_level):
+        return False
+    if tuples and (row.get("role"), row.get("technical_area"), row.get("role_level")) not in tuples:
+        return False
+    if request.technologies and not set(row.get("technologies") or []) & set(request.technologies):
+        return False
+    return True
+
+
+def request_pool(rows, request, limit):
+    """The request's own candidate rows, in the pool's (SFIA) order, capped like a single fetch."""
+    tuples = requirement_tuples([req.model_dump(by_alias=True) for req in request.requirements])
+    return [row for row in rows if matches_request(row, request, tuples)][:limit]
+
+
+def allocation_order(requests, pools):
+    """Requests with the fewest distinct candidates per seat are filled first."""
+    def scarcity(position):
+        people = len({str(row["employee_id"]) for row in pools[position]})
+        return people / max(requests[position].team_size, 1)
+
+    return sorted(range(len(requests)), key=scarcity)
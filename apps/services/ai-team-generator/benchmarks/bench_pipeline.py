@@ -0,0 +1,337 @@
+"""
+Per-stage micro-benchmarks of the /generate-teams, /find-team-members and
+/reanalyze-team pipelines, fully offline.
+
+The database is a StubDatabase behind the real TeamDatabaseService and the
+model is an httpx.MockTransport behind the real LLMClient, so every stage
+runs the service's own code except the network round trips. Each stage is
+timed on its own at several candidate-pool sizes and the results are
+written as JSON:
+
+    python -m benchmarks.bench_pipeline --sizes 20 60 200 1000 --output bench.json
+
+--db-round-trip-ms adds a simulated latency to every database round trip,
+so stages that differ in the number of queries (serial_load against
+data_load for /find-team-members) compare as they would over a network.
+data_load is only the database round trip; the skill similarity ranking
+of the pool it reads is timed as similarity_ranking.
+
+index_search ranks a CandidateIndex snapshot by skill similarity, the
+path /find-team-members takes when the index is enabled. The snapshot has
+as many employees as the pool unless --index-size sets it, e.g.
+--index-size 100000 to time it at the scale of a whole organization.
+
+With --baseline the run is compared against an earlier results file and
+the command exits with status 1 when a stage's median got slower than
+--threshold (default 25%).
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import main2
+from benchmarks.fixtures import (
+    WEIGHTS, StubDatabase, candidate_records, fake_output, index_records, mock_llm_client, team_result,
+)
+from candidate_encoding import CandidateEncoder, compact_json
+from candidate_index import CandidateIndex
+from json_extraction import call_tool, tool_output
+from prompts import FIND_TEAM_MEMBERS, GENERATE_TEAMS, REANALYZE_TEAM
+from skill_index import rank_rows
+from team_db_service import (
+    CANDIDATE_COLUMNS, MATCH_PROFILE_VIEW, PRIVACY_FILTER, SQL_SEARCH_POOL_FACTOR, TeamDatabaseService, _row_to_dict,
+)
+from team_state import TeamState
+
+DEFAULT_SIZES = (20, 60, 200, 1000)
+TEAM_SIZE = 5
+# /reanalyze-team receives a whole team, not a candidate pool
+MAX_REANALYSIS_MEMBERS = 20
+
+# The candidate query /find-team-members ran after get_team_data before the
+# team_search statement replaced both; only the serial_load baseline runs it
+SERIAL_TEAM_CANDIDATES = f"""
+        SELECT{CANDIDATE_COLUMNS},
+            mp.technologies && CAST(:techs AS text[]) AS has_required_tech
+        FROM {MATCH_PROFILE_VIEW} AS mp
+        WHERE NOT EXISTS (
+            SELECT 1 FROM public.team_members tm
+            WHERE tm.team_id = :team_id AND tm.employee_profile_id = mp.employee_id
+          )
+          AND (CAST(:role AS text) IS NULL OR mp.role = CAST(:role AS text))
+          AND (cardinality(CAST(:areas AS text[])) = 0 OR mp.technical_area = ANY(CAST(:areas AS text[])))
+          AND (CAST(:level AS text) IS NULL OR mp.role_level = CAST(:level AS text))
+          {PRIVACY_FILTER}
+          AND (cardinality(CAST(:techs AS text[])) = 0 OR mp.technologies && CAST(:techs AS text[]))
+        ORDER BY has_required_tech DESC, mp.sfia_level DESC
+        LIMIT :limit
+        """
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter_ns() - started)
+
+    def summary(self):
+        results = {}
+        for name, samples in self.samples.items():
+            micros = [s / 1000 for s in samples]
+            results[name] = {
+                "runs": len(micros),
+                "median_us": statistics.median(micros),
+                "p95_us": float(np.percentile(micros, 95)),
+                "mean_us": statistics.fmean(micros),
+                "min_us": min(micros),
+            }
+        return results
+
+
+def generation_request(records):
+    roles = sorted({(r["role"], r["technical_area"], r["role_level"]) for r in records[:TEAM_SIZE]})
+    return main2.TeamGenerationRequest(
+        CreatorId="00000000-0000-0000-0000-000000000001",
+        TeamSize=TEAM_SIZE,
+        Requirements=[{"Role": role, "Area": area, "Level": level} for role, area, level in roles],
+        Technologies=["Python", "React", "PostgreSQL"],
+        SfiaLevel=1,
+        Weights=WEIGHTS,
+        Availability=True,
+    )
+
+
+async def bench_generate_teams(timer, db_service, llm_client, records, size):
+    request = generation_request(records)
+    requirements = [req.model_dump(by_alias=True) for req in request.requirements]
+
+    with timer.stage("candidate_query"):
+        employees_data = await db_service.get_generation_candidates(
+            requirements, request.technologies, request.sfia_level, request.availability, limit=size
+        )
+    with timer.stage("row_to_dict"):
+        [_row_to_dict(r) for r in records]
+    with timer.stage("scoring"):
+        scores = main2.score_generation_candidates(request, employees_data)
+    with timer.stage("optimization"):
+        assignment, alternates = main2.select_team(request, scores)
+    with timer.stage("json_serialization"):
+        rows = [main2._prompt_row(scores, i) for i in list(assignment.indices) + list(alternates)]
+        compact_json(CandidateEncoder().encode(rows))
+    with timer.stage("prompt_assembly"):
+        messages, encoder, max_tokens = main2.build_generation_messages(request, scores, assignment, alternates)
+    with timer.stage("llm_call"):
+        _, parser = await call_tool(
+            llm_client,
+            model=main2.GENERATION_MODEL,
+            max_tokens=max_tokens,
+            system=GENERATE_TEAMS.system_blocks(),
+            messages=messages,
+            **GENERATE_TEAMS.tool_params(),
+        )
+    with timer.stage("json_extraction"):
+        explanation, _ = tool_output(GENERATE_TEAMS.tool, parser)
+    with timer.stage("response_build"):
+        main2.build_team_response(assignment, scores, encoder.decode(explanation.model_dump()))
+
+
+async def bench_find_team_members(timer, db_service, llm_client, candidate_index, records, size):
+    request = main2.FindTeamMemberRequest(
+        TeamId="00000000-0000-0000-0000-000000000002",
+        Role="Developer",
+        Area="Backend",
+        Level="Senior",
+        Technologies=["Python", "React"],
+    )
+
+    # The serial team and candidate queries the endpoint used to run, against its single statement
+    serial_values = db_service._team_candidate_values(
+        request.team_id, request.role, request.area, request.level, request.technologies, size
+    )
+    with timer.stage("serial_load"):
+        await db_service.get_team_data(request.team_id)
+        rows = await db_service._fetch_all(SERIAL_TEAM_CANDIDATES, serial_values, label="team_candidates")
+        [_row_to_dict(r) for r in rows]
+    # The endpoint's single statement, then the similarity ranking of its pool, timed apart
+    values = db_service._team_candidate_values(
+        request.team_id, request.role, request.area, request.level, request.technologies,
+        size * SQL_SEARCH_POOL_FACTOR,
+    )
+    with timer.stage("data_load"):
+        team_data, pool = await db_service._team_search_pool(values)
+    with timer.stage("similarity_ranking"):
+        candidates_data = rank_rows(pool, request.technologies, values["areas"], team_data["members"], size)
+    with timer.stage("index_search"):
+        candidate_index.team_candidates(
+            team_data["member_ids"], request.role, request.area, request.level, request.technologies,
+            limit=size, members=team_data["members"],
+        )
+    with timer.stage("row_to_dict"):
+        [_row_to_dict(r) for r in records]
+    with timer.stage("scoring"):
+        scores = main2.score_team_candidates(request, team_data, candidates_data)
+    with timer.stage("json_serialization"):
+        compact_json(team_data)
+        compact_json(CandidateEncoder().encode(main2.prompt_candidates(scores)))
+    with timer.stage("prompt_assembly"):
+        messages, encoder, max_tokens = main2.build_candidate_search_messages(request, team_data, scores)
+    with timer.stage("llm_call"):
+        _, parser = await call_tool(
+            llm_client,
+            model=main2.GENERATION_MODEL,
+            max_tokens=max_tokens,
+            system=FIND_TEAM_MEMBERS.system_blocks(),
+            messages=messages,
+            **FIND_TEAM_MEMBERS.tool_params(),
+        )
+    with timer.stage("json_extraction"):
+        output, _ = tool_output(FIND_TEAM_MEMBERS.tool, parser)
+        encoder.decode([candidate.model_dump() for candidate in output.candidates])
+
+
+async def bench_reanalyze_team(timer, llm_client, records):
+    members = [_row_to_dict(r) for r in records[:MAX_REANALYSIS_MEMBERS]]
+    request = main2.TeamReanalysisRequest(
+        TeamId="00000000-0000-0000-0000-000000000003",
+        members=members,
+        technologies=["Python", "React"],
+        weights=WEIGHTS,
+    )
+    # The team before its last member joined, with a narrative already written for it
+    state = TeamState.from_team({"members": members[:-1]}, request.weights, request.technologies)
+    state.remember(fake_output({"messages": [{"content": ""}]}))
+
+    with timer.stage("full_rescore"):
+        TeamState.from_team(None, request.weights, request.technologies).update(request.members)
+    with timer.stage("incremental_update"):
+        change = state.update(request.members)
+    with timer.stage("prompt_assembly"):
+        messages, max_tokens = main2.build_reanalysis_messages(request, change)
+    with timer.stage("llm_call"):
+        _, parser = await call_tool(
+            llm_client,
+            model=main2.GENERATION_MODEL,
+            max_tokens=max_tokens,
+            system=REANALYZE_TEAM.system_blocks(),
+            messages=messages,
+            **REANALYZE_TEAM.tool_params(),
+        )
+    with timer.stage("json_extraction"):
+        tool_output(REANALYZE_TEAM.tool, parser)
+
+
+async def run_size(size, repeat, warmup, seed, db_round_trip_ms=0.0, index_size=None):
+    records = candidate_records(size, seed=seed)
+    candidate_index = CandidateIndex()
+    candidate_index.load(index_records(candidate_records(index_size, seed=seed) if index_size else records))
+    team_members = [_row_to_dict(r) for r in records[:TEAM_SIZE]]
+    db_service = TeamDatabaseService("postgresql://benchmark/benchmark")
+    db_service.db = StubDatabase(
+        records, team_result(team_members, "00000000-0000-0000-0000-000000000002"), round_trip_ms=db_round_trip_ms
+    )
+    llm_client = mock_llm_client(fake_output)
+
+    pipelines = {
+        "generate-teams": lambda timer: bench_generate_teams(timer, db_service, llm_client, records, size),
+        "find-team-members": lambda timer: bench_find_team_members(
+            timer, db_service, llm_client, candidate_index, records, size
+        ),
+        "reanalyze-team": lambda timer: bench_reanalyze_team(timer, llm_client, records),
+    }
+    results = []
+    try:
+        for endpoint, pipeline in pipelines.items():
+            for _ in range(warmup):
+                await pipeline(StageTimer())
+            timer = StageTimer()
+            for _ in range(repeat):
+                await pipeline(timer)
+            for stage, stats in timer.summary().items():
+                results.append({"endpoint": endpoint, "pool_size": size, "stage": stage, **stats})
+    finally:
+        await llm_client.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Stages whose median grew by more than `threshold` against the baseline file."""
+    previous = {(r["endpoint"], r["pool_size"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["endpoint"], result["pool_size"], result["stage"]))
+        if before and before["median_us"] > 0:
+            change = result["median_us"] / before["median_us"] - 1
+            if change > threshold:
+                regressions.append({**result, "baseline_median_us": before["median_us"], "change": change})
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="candidate pool sizes")
+    parser.add_argument("--repeat", type=int, default=30, help="timed runs per pipeline and size")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed runs before measuring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--db-round-trip-ms", type=float, default=0.0, help="simulated latency of every database round trip"
+    )
+    parser.add_argument("--index-size", type=int, help="employees in the index_search snapshot (default: pool size)")
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed median slowdown (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for size in args.sizes:
+        results.extend(asyncio.run(run_size(size, args.repeat, args.warmup, args.seed, args.db_round_trip_ms, args.index_size)))
+        print(f"pool_size={size} done")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "db_round_trip_ms": args.db_round_trip_ms,
+            "index_size": args.index_size,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for r in results:
+        print(f"{r['endpoint']:<18} {r['pool_size']:>6} {r['stage']:<20} median {r['median_us']:>10.1f} us  p95 {r['p95_us']:>10.1f} us")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for r in regressions:
+            print(f"⚠️ REGRESSION {r['endpoint']} {r['pool_size']} {r['stage']}: "
+                  f"{r['baseline_median_us']:.1f} -> {r['median_us']:.1f} us (+{r['change'] * 100:.0f}%)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Latency-injecting stand-in for the Anthropic Messages API.
+
+Answers POST /v1/messages (plain and streaming) and
+/v1/messages/count_tokens with the canned answers of the offline
+benchmarks, calling the forced output tool and cut at the request's
+max_tokens like the real API, after sleeping for a log-normally distributed time, so load
+tests exercise the service's concurrency limits without spending tokens:
+
+    python -m benchmarks.fake_llm_server --port 8090 --latency-ms 4000 --sigma 0.4
+    LLM_BASE_URL=http://localhost:8090 CLAUDE_API_KEY=fake uvicorn main2:app --port 8001
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from benchmarks.fixtures import answer_payload, fake_output, sse_events
+from prompts import estimate_tokens
+
+# Median latency and log-normal spread; overridden from the command line
+LATENCY = {"median_ms": 3000.0, "sigma": 0.4}
+STREAM_CHUNK_CHARS = 40
+
+app = FastAPI()
+
+
+async def _model_delay():
+    delay_ms = LATENCY["median_ms"] * math.exp(random.gauss(0, LATENCY["sigma"]))
+    await asyncio.sleep(delay_ms / 1000)
+
+
+async def _stream(payload, raw):
+    for event in sse_events(payload, raw, STREAM_CHUNK_CHARS):
+        await asyncio.sleep(0)
+        yield event
+
+
+@app.post("/v1/messages")
+async def messages(request: Request):
+    body = await request.json()
+    await _model_delay()
+    payload, raw = answer_payload(body, fake_output(body))
+    payload["usage"]["input_tokens"] = estimate_tokens(json.dumps(body, ensure_ascii=False))
+    if body.get("stream"):
+        return StreamingResponse(_stream(payload, raw), media_type="text/event-stream")
+    return payload
+
+
+@app.post("/v1/messages/count_tokens")
+async def count_tokens(request: Request):
+    body = await request.json()
+    return {"input_tokens": estimate_tokens(json.dumps(body, ensure_ascii=False))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Messages API with injected latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=LATENCY["median_ms"], help="median model latency")
+    parser.add_argument("--sigma", type=float, default=LATENCY["sigma"], help="log-normal spread of the latency")
+    args = parser.parse_args(argv)
+    LATENCY.update(median_ms=args.latency_ms, sigma=args.sigma)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Deterministic fake data and stubs for the offline benchmarks.
+
+`StubDatabase` stands in for the `databases.Database` inside
+TeamDatabaseService and returns pre-built rows shaped like the candidate
+queries' (list columns as JSON text, like the jsonb aggregates asyncpg
+hands back), so the service's own row conversion still runs.
+`mock_llm_client` wires an LLMClient to an httpx.MockTransport that answers
+every call with a canned Messages API response (streamed when asked);
+`fake_output` fills the output tool each prompt forces, reusing the short
+ids found in the prompt.
+"""
+import asyncio
+import json
+import random
+import re
+import uuid
+from contextlib import asynccontextmanager
+
+import httpx
+from anthropic import AsyncAnthropic
+
+from json_extraction import CONTINUATION_NOTE, CONTINUATION_REQUEST
+from llm_client import LLMClient
+from prompts import FIND_TEAM_MEMBERS, GENERATE_TEAMS
+from team_db_service import LIVE_PROFILE_QUERIES, MATCH_PROFILE_QUERIES
+
+TEAM_SEARCH_QUERIES = (MATCH_PROFILE_QUERIES["team_search"], LIVE_PROFILE_QUERIES["team_search"])
+
+ROLES = ("Developer", "QA", "DevOps", "Designer", "Data Scientist")
+AREAS = ("Web Development", "Backend", "Mobile", "Cloud", "Data")
+LEVELS = ("Junior", "Staff", "Senior", "Architect")
+TECHNOLOGIES = (
+    "C#", ".NET", "Python", "FastAPI", "React", "Angular", "TypeScript", "Java", "Spring", "Go",
+    "PostgreSQL", "Docker", "Kubernetes", "AWS", "Azure", "Terraform", "Kotlin", "Swift", "Flutter", "Vue",
+)
+INTERESTS = ("Gaming", "Music", "Reading", "Sports", "Travel", "Cooking", "Photography", "Open Source")
+LANGUAGES = ("Spanish", "English", "Portuguese", "French", "German")
+MBTI_TYPES = (
+    "INTJ", "INTP", "ENTJ", "ENTP", "INFJ", "INFP", "ENFJ", "ENFP",
+    "ISTJ", "ISFJ", "ESTJ", "ESFJ", "ISTP", "ISFP", "ESTP", "ESFP",
+)
+TIMEZONES = ("America/La_Paz", "America/Bogota", "America/Mexico_City", "Europe/Madrid", "America/New_York")
+COUNTRIES = ("Bolivia", "Colombia", "Mexico", "Spain", "United States")
+
+SHORT_ID = re.compile(r'\["(c\d+)"')
+
+WEIGHTS = {
+    "SfiaWeight": 20,
+    "TechnicalWeight": 25,
+    "PsychologicalWeight": 15,
+    "ExperienceWeight": 15,
+    "LanguageWeight": 10,
+    "InterestsWeight": 5,
+    "TimezoneWeight": 10,
+}
+
+
+def candidate_records(count, seed=0):
+    """Candidate rows as the database returns them, best SFIA level first."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        records.append({
+            "employee_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"Empleado {i}",
+            "role": rng.choice(ROLES),
+            "technical_area": rng.choice(AREAS),
+            "role_level": rng.choice(LEVELS),
+            "years_experience": rng.randint(0, 15),
+            "sfia_level": rng.randint(1, 7),
+            "mbti": rng.choice(MBTI_TYPES),
+            "timezone": rng.choice(TIMEZONES),
+            "country": rng.choice(COUNTRIES),
+            "availability": True,
+            "technologies": json.dumps(rng.sample(TECHNOLOGIES, rng.randint(2, 8))),
+            "interests": json.dumps(rng.sample(INTERESTS, rng.randint(0, 4))),
+            "languages": json.dumps(rng.sample(LANGUAGES, rng.randint(1, 3))),
+        })
+    records.sort(key=lambda r: -r["sfia_level"])
+    return records
+
+
+def index_records(records):
+    """Candidate records as CandidateIndex loads them (decoded lists, user and verification columns)."""
+    return [
+        {
+            **record,
+            **{column: json.loads(record[column]) for column in ("technologies", "interests", "languages")},
+            "user_id": record["employee_id"],
+            "verification_status": "2",
+        }
+        for record in records
+    ]
+
+
+def team_result(members, team_id):
+    """The jsonb document get_team_data reads, built from decoded candidate rows."""
+    return json.dumps({
+        "team": {
+            "id": team_id,
+            "name": "Equipo de prueba",
+            "compatibility_score": 80,
+            "creator_id": "00000000-0000-0000-0000-000000000001",
+            "ai_analysis": None,
+            "weight_criteria": json.dumps(WEIGHTS),
+        },
+        "members": [
+            {
+                "profile_id": row["employee_id"],
+                "first_name": row["name"],
+                "last_name": "",
+                "role": row["role"],
+                "role_level": row["role_level"],
+                "years_experience": row["years_experience"],
+                "sfia_level": row["sfia_level"],
+                "mbti": row["mbti"],
+                "timezone": row["timezone"],
+                "country": row["country"],
+                "availability": row["availability"],
+                "technologies": row["technologies"],
+                "interests": row["interests"],
+                "languages": row["languages"],
+            }
+            for row in members
+        ],
+        "member_ids": [row["employee_id"] for row in members],
+    })
+
+
+class StubConnection:
+    def __init__(self, database):
+        self.database = database
+
+    async def _round_trip(self):
+        self.database.queries += 1
+        if self.database.round_trip_ms:
+            await asyncio.sleep(self.database.round_trip_ms / 1000)
+
+    async def fetch_all(self, query, values=None):
+        await self._round_trip()
+        if query in TEAM_SEARCH_QUERIES:
+            rows = self.database.records[:values["limit"]]
+            return [
+                {"result": self.database.team if position == 1 else None, **row, "position": position}
+                for position, row in enumerate(rows, start=1)
+            ] or [{"result": self.database.team, "employee_id": None, "position": None}]
+        return self.database.records
+
+    async def fetch_one(self, query, values=None):
+        await self._round_trip()
+        return {"result": self.database.team}
+
+
+class StubDatabase:
+    """
+    Replaces TeamDatabaseService.db; every candidate query returns `records`
+    after `round_trip_ms` of simulated network and server time.
+    """
+
+    def __init__(self, records, team=None, round_trip_ms=0.0):
+        self.records = records
+        self.team = team
+        self.round_trip_ms = round_trip_ms
+        self.queries = 0
+
+    @asynccontextmanager
+    async def connection(self):
+        yield StubConnection(self)
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+
+def fenced(payload):
+    """The model's answer as Claude often writes it, inside a markdown code block."""
+    return "```json\n" + json.dumps(payload, ensure_ascii=False, indent=2) + "\n```"
+
+
+def fake_output(body):
+    """The input the model gives the output tool the request forces."""
+    system = body.get("system") or ""
+    if isinstance(system, list):
+        system = "".join(block["text"] for block in system)
+    content = body["messages"][0]["content"]
+    short_ids = SHORT_ID.findall(content)
+    if GENERATE_TEAMS.system in system:
+        return {
+            "recommended_leader": {"id": short_ids[0], "name": "Líder", "rationale": "Mayor nivel SFIA del equipo."},
+            "team_analysis": {
+                "strengths": ["Buena cobertura tecnológica"] * 3,
+                "weaknesses": ["Poca experiencia en la nube"] * 2,
+                "compatibility": "Equipo equilibrado. " * 20,
+            },
+            "recommended_Members": [
+                {"id": short_id, "name": "Alternativo", "compatibility_score": 70, "analysis": "Buen encaje. " * 10,
+                 "potential_conflicts": [], "team_impact": "Refuerza el equipo."}
+                for short_id in short_ids[-3:]
+            ],
+        }
+    if FIND_TEAM_MEMBERS.system in system:
+        return {"candidates": [
+            {"employee_id": short_id, "name": "Candidato", "role": "Developer", "area": "Backend",
+             "technologies": ["Python", "React"], "sfia_level": 4, "compatibility_score": 80,
+             "analysis": "Buen encaje técnico y de personalidad. " * 5}
+            for short_id in short_ids[:5]
+        ]}
+    return {
+        "updated_strengths": ["Fortaleza técnica"] * 3,
+        "updated_weaknesses": ["Debilidad de coordinación"] * 2,
+        "detailed_analysis": "Análisis del equipo. " * 40,
+        "recommendations": ["Recomendación"] * 3,
+    }
+
+
+def answer_payload(body, output):
+    """
+    Messages API response to `body` when the model's complete answer is
+    `output`: a call to the tool the request forces (fenced text when it
+    forces none), cut at max_tokens (4 characters per token) like the real
+    API. A continuation request gets the text of the tool input after the
+    part it passes back. Returns (payload, raw), `raw` being the text or
+    tool input JSON as it is streamed.
+    """
+    tool = (body.get("tool_choice") or {}).get("name")
+    raw = json.dumps(output, ensure_ascii=False) if tool else fenced(output)
+    if body["messages"][-1]["content"] == CONTINUATION_REQUEST:
+        partial = body["messages"][-2]["content"].removeprefix(f"{CONTINUATION_NOTE}\n")
+        raw = json.dumps(output, ensure_ascii=False)[len(partial):]
+    stop_reason = "tool_use" if tool else "end_turn"
+    limit = body.get("max_tokens", 0) * 4
+    if limit and len(raw) > limit:
+        raw, stop_reason = raw[:limit], "max_tokens"
+    if tool:
+        block = {"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex}", "name": tool,
+                 "input": output if stop_reason == "tool_use" else {}}
+    else:
+        block = {"type": "text", "text": raw}
+    payload = {
+        "id": f"msg_{uuid.uuid4().hex}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", ""),
+        "content": [block],
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1000, "output_tokens": len(raw) // 4},
+    }
+    return payload, raw
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_events(payload, raw, chunk_chars=40):
+    """`payload` as the Messages API streams it, `raw` sent in chunks of `chunk_chars`."""
+    block = payload["content"][0]
+    tool = block["type"] == "tool_use"
+    yield _sse("message_start", {"type": "message_start", "message": {**payload, "content": [], "stop_reason": None}})
+    yield _sse("content_block_start", {
+        "type": "content_block_start",
+        "index": 0,
+        "content_block": {**block, "input": {}} if tool else {"type": "text", "text": ""},
+    })
+    for start in range(0, len(raw), chunk_chars):
+        chunk = raw[start:start + chunk_chars]
+        delta = {"type": "input_json_delta", "partial_json": chunk} if tool else {"type": "text_delta", "text": chunk}
+        yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": delta})
+    yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+    yield _sse("message_delta", {
+        "type": "message_delta",
+        "delta": {"stop_reason": payload["stop_reason"], "stop_sequence": None},
+        "usage": payload["usage"],
+    })
+    yield _sse("message_stop", {"type": "message_stop"})
+
+
+def mock_llm_client(answer):
+    """
+    LLMClient whose HTTP calls never leave the process. `answer(request_body)`
+    returns the complete output the fake model writes.
+    """
+    def handler(request):
+        body = json.loads(request.content)
+        payload, raw = answer_payload(body, answer(body))
+        if body.get("stream"):
+            return httpx.Response(
+                200, content="".join(sse_events(payload, raw)).encode(), headers={"content-type": "text/event-stream"}
+            )
+        return httpx.Response(200, json=payload)
+
+    llm_client = LLMClient(api_key="benchmark", max_retries=0)
+    llm_client.client = AsyncAnthropic(
+        api_key="benchmark",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return llm_client
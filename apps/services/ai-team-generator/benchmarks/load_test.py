@@ -0,0 +1,180 @@
+"""
+Closed-loop load test against a running service.
+
+`--concurrency` virtual users each send a request, wait for the answer and
+immediately send the next one, for `--duration` seconds after a warm-up.
+Requests follow run.py's shape and use the team, manager and role ids of a
+synthetic organization manifest (benchmarks.synthetic_org), so they hit
+real rows. Run the service against the fake LLM server to measure
+everything but the model:
+
+    python -m benchmarks.fake_llm_server --latency-ms 3000 &
+    LLM_BASE_URL=http://localhost:8090 CLAUDE_API_KEY=fake uvicorn main2:app --port 8001 &
+    python -m benchmarks.load_test --manifest org-10k.json --concurrency 32 --duration 120 \
+        --endpoint generate-teams --endpoint find-team-members --output load-10k.json
+
+Throughput and p50/p95/p99 latency are reported per endpoint.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.fixtures import TECHNOLOGIES, WEIGHTS, candidate_records
+from team_db_service import _row_to_dict
+
+ENDPOINTS = {
+    "generate-teams": "/generate-teams",
+    "generate-teams-stream": "/generate-teams/stream",
+    "generate-teams-batch": "/generate-teams/batch",
+    "find-team-members": "/find-team-members",
+    "reanalyze-team": "/reanalyze-team",
+}
+BATCH_TEAMS = 3
+
+
+class RequestFactory:
+    """Random, manifest-backed request bodies in the shape the backend sends."""
+
+    def __init__(self, manifest, seed=0):
+        self.manifest = manifest
+        self.rng = random.Random(seed)
+        self.members = [_row_to_dict(r) for r in candidate_records(200, seed=seed)]
+
+    def generate_teams(self):
+        rng = self.rng
+        team_size = rng.randint(3, 6)
+        return {
+            "CreatorId": rng.choice(self.manifest["managers"]),
+            "TeamSize": team_size,
+            "Requirements": rng.sample(self.manifest["requirements"], rng.randint(1, min(3, team_size))),
+            "Technologies": rng.sample(TECHNOLOGIES, rng.randint(1, 3)),
+            "SfiaLevel": rng.randint(1, 3),
+            "Weights": WEIGHTS,
+            "Availability": True,
+        }
+
+    def generate_teams_batch(self):
+        return {"Teams": [self.generate_teams() for _ in range(BATCH_TEAMS)]}
+
+    def find_team_members(self):
+        requirement = self.rng.choice(self.manifest["requirements"])
+        return {
+            "TeamId": self.rng.choice(self.manifest["teams"]),
+            **requirement,
+            "Technologies": self.rng.sample(TECHNOLOGIES, self.rng.randint(1, 3)),
+        }
+
+    def reanalyze_team(self):
+        return {
+            "TeamId": self.rng.choice(self.manifest["teams"]),
+            "members": self.rng.sample(self.members, self.rng.randint(3, 8)),
+            "technologies": self.rng.sample(TECHNOLOGIES, 3),
+            "weights": WEIGHTS,
+        }
+
+    def build(self, endpoint):
+        if endpoint in ("generate-teams", "generate-teams-stream"):
+            return self.generate_teams()
+        return getattr(self, endpoint.replace("-", "_"))()
+
+
+async def virtual_user(client, factory, endpoints, query, deadline, measure_from, samples):
+    while time.monotonic() < deadline:
+        endpoint = factory.rng.choice(endpoints)
+        body = factory.build(endpoint)
+        started = time.monotonic()
+        try:
+            response = await client.post(ENDPOINTS[endpoint], json=body, params=query)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finished = time.monotonic()
+        if started >= measure_from and finished <= deadline:
+            samples.append((endpoint, status, finished - started))
+
+
+def summarize(samples, duration):
+    report = {}
+    for endpoint in sorted({s[0] for s in samples}):
+        rows = [s for s in samples if s[0] == endpoint]
+        ok = np.array([latency for _, status, latency in rows if status == 200]) * 1000
+        statuses = {}
+        for _, status, _ in rows:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        report[endpoint] = {
+            "requests": len(rows),
+            "errors": len(rows) - len(ok),
+            "statuses": statuses,
+            "throughput_rps": len(ok) / duration,
+            "p50_ms": float(np.percentile(ok, 50)) if len(ok) else None,
+            "p95_ms": float(np.percentile(ok, 95)) if len(ok) else None,
+            "p99_ms": float(np.percentile(ok, 99)) if len(ok) else None,
+            "mean_ms": float(ok.mean()) if len(ok) else None,
+        }
+    return report
+
+
+async def run(args, manifest):
+    factory = RequestFactory(manifest, seed=args.seed)
+    query = {"mode": args.mode} if args.mode else None
+    samples = []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.target, timeout=args.timeout, limits=limits) as client:
+        measure_from = time.monotonic() + args.warmup
+        deadline = measure_from + args.duration
+        await asyncio.gather(*(
+            virtual_user(client, factory, args.endpoint, query, deadline, measure_from, samples)
+            for _ in range(args.concurrency)
+        ))
+    return summarize(samples, args.duration)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Closed-loop load test of the team generator")
+    parser.add_argument("--target", default="http://localhost:8001")
+    parser.add_argument("--manifest", required=True, help="manifest written by benchmarks.synthetic_org")
+    parser.add_argument("--endpoint", action="append", choices=sorted(ENDPOINTS), help="repeat to mix endpoints")
+    parser.add_argument("--mode", choices=("llm", "local"), help="mode query parameter for the generation endpoints")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=10.0, help="seconds before measuring")
+    parser.add_argument("--timeout", type=float, default=180.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load-test-results.json")
+    args = parser.parse_args(argv)
+    args.endpoint = args.endpoint or ["generate-teams"]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(args.manifest, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    report = asyncio.run(run(args, manifest))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "target": args.target,
+            "employees": manifest.get("employees"),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mode": args.mode or "llm",
+            "endpoints": report,
+        }, f, indent=2)
+
+    for endpoint, stats in report.items():
+        latency = (
+            f"p50 {stats['p50_ms']:.0f} ms  p95 {stats['p95_ms']:.0f} ms  p99 {stats['p99_ms']:.0f} ms"
+            if stats["p50_ms"] is not None else "no successful requests"
+        )
+        print(f"{endpoint:<22} {stats['throughput_rps']:7.2f} req/s  errors {stats['errors']:>5}  {latency}")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
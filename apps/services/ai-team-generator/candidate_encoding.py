@@ -0,0 +1,116 @@
+"""
+Compact tabular encoding of the candidate rows sent to the model.
+
+Plain `json.dumps` of the rows repeats every key and every technology,
+interest and language string for every candidate. Here each table has one
+header (`columns`) and one short array per candidate; list columns hold
+indexes into shared `dictionaries`, and employee ids are replaced by short
+ids ("c1", "c2"...) that `decode` maps back in the model's answer.
+
+Savings are measured per endpoint against the plain encoding and exposed
+through `get_encoding_stats`.
+"""
+import json
+
+from prompts import estimate_tokens
+
+ID_KEYS = ("employee_id", "id", "profile_id")
+
+_ENCODING_STATS = {}
+
+
+def compact_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class CandidateEncoder:
+    """Encodes one request's candidate rows; keeps the short id mapping to decode the answer."""
+
+    def __init__(self, id_prefix="c"):
+        self.id_prefix = id_prefix
+        self.dictionaries = {}
+        self._dictionary_index = {}
+        self._short_ids = {}
+        self._real_ids = {}
+
+    def short_id(self, employee_id) -> str:
+        employee_id = str(employee_id)
+        if employee_id not in self._short_ids:
+            short = f"{self.id_prefix}{len(self._short_ids) + 1}"
+            self._short_ids[employee_id] = short
+            self._real_ids[short] = employee_id
+        return self._short_ids[employee_id]
+
+    def _reference(self, column, value):
+        index = self._dictionary_index.setdefault(column, {})
+        if value not in index:
+            index[value] = len(index)
+            self.dictionaries.setdefault(column, []).append(value)
+        return index[value]
+
+    def _encode_value(self, column, value):
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return [self._reference(column, item) for item in value]
+        return value
+
+    def encode(self, rows):
+        """Returns {"columns": [...], "rows": [[...], ...]} with "id" as the first column."""
+        columns = []
+        for row in rows:
+            for key in row:
+                if key not in ID_KEYS and key not in columns:
+                    columns.append(key)
+        encoded_rows = []
+        for row in rows:
+            employee_id = next((row[key] for key in ID_KEYS if row.get(key)), None)
+            encoded_rows.append(
+                [self.short_id(employee_id) if employee_id is not None else None]
+                + [self._encode_value(column, row.get(column)) for column in columns]
+            )
+        return {"columns": ["id"] + columns, "rows": encoded_rows}
+
+    def dictionaries_json(self) -> str:
+        return compact_json(self.dictionaries)
+
+    def knows(self, value) -> bool:
+        """Whether `value` is a short id this encoder handed out."""
+        return isinstance(value, str) and value.strip() in self._real_ids
+
+    def decode_id(self, value):
+        """Maps a short id back to the employee id; anything else is returned unchanged."""
+        return self._real_ids.get(str(value).strip(), value) if isinstance(value, str) else value
+
+    def decode(self, value):
+        """Replaces short ids under id keys anywhere in a parsed model answer."""
+        if isinstance(value, dict):
+            return {
+                key: self.decode_id(item) if key in ID_KEYS else self.decode(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        return value
+
+
+def record_savings(endpoint, rows, encoded_text):
+    """Compares the encoded payload with the plain JSON the endpoint used to send."""
+    plain_text = json.dumps(rows, ensure_ascii=False, default=str)
+    stats = _ENCODING_STATS.setdefault(
+        endpoint, {"calls": 0, "plain_chars": 0, "encoded_chars": 0, "plain_tokens": 0, "encoded_tokens": 0}
+    )
+    stats["calls"] += 1
+    stats["plain_chars"] += len(plain_text)
+    stats["encoded_chars"] += len(encoded_text)
+    stats["plain_tokens"] += estimate_tokens(plain_text)
+    stats["encoded_tokens"] += estimate_tokens(encoded_text)
+
+
+def get_encoding_stats():
+    return {
+        endpoint: {
+            **stats,
+            "tokens_saved": stats["plain_tokens"] - stats["encoded_tokens"],
+            "savings_ratio": 1 - stats["encoded_tokens"] / stats["plain_tokens"] if stats["plain_tokens"] else 0.0,
+        }
+        for endpoint, stats in _ENCODING_STATS.items()
+    }
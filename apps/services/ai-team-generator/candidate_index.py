@@ -0,0 +1,380 @@
+"""
+Optional in-memory index of the consenting employee profiles.
+
+The snapshot holds the same rows the candidate queries return (one per
+employee and specialized role) and inverted indexes from role, technical
+area, role level, technology, SFIA level, availability and verification
+status to bitsets of row positions. Python ints are used as bitsets, so a
+request's filters are a handful of AND/OR operations over the snapshot.
+Team candidates are then ranked by skill similarity (skill_index) over
+every row that passes the filters rather than cut by technology and SFIA.
+
+`CandidateIndexSync` bulk loads the snapshot, listens for the ids of
+changed employees that the backend's EmployeeMatchChangeNotifications
+migration `pg_notify`s from triggers, and applies those changes in small
+batches. When the snapshot has not been confirmed fresh within
+`max_staleness_s` the database service falls back to SQL.
+"""
+import asyncio
+import logging
+import time
+
+import asyncpg
+
+from skill_index import SkillIndex, bits_to_mask, normalized_technologies
+from team_db_service import APPROVED_VERIFICATION_STATUS, LIVE_PROFILE_QUERIES, parse_level, split_areas
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "employee_match_changed"
+
+# Pause before reconnecting the change feed after a failure
+RETRY_DELAY_S = 5.0
+
+# Name of the triggers the backend migration installs on each watched table
+NOTIFY_TRIGGER = "employee_match_changed"
+
+# Tables whose changes affect an employee's match profile, and the column
+# that identifies the employee (or their user) in each
+WATCHED_TABLES = {
+    "employee_profiles": "employee",
+    "employee_specialized_roles": "employee",
+    "employee_technologies": "employee",
+    "personal_interests": "employee",
+    "employee_languages": "employee",
+    "user_privacy_consents": "user",
+}
+
+# Columns returned to callers; user_id and verification_status are only indexed
+ROW_KEYS = (
+    "employee_id", "name", "role", "technical_area", "role_level", "years_experience", "sfia_level",
+    "mbti", "timezone", "country", "availability", "technologies", "interests", "languages",
+)
+
+
+def _positions(bits):
+    """Row positions of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class CandidateIndex:
+    def __init__(self):
+        self._reset()
+        self.loaded_at = None
+        self.synced_at = None
+
+    def _reset(self):
+        self.rows = []
+        self.alive = 0
+        self.by_role = {}
+        self.by_area = {}
+        self.by_level = {}
+        self.by_technology = {}
+        self.by_sfia = {}
+        self.by_availability = {}
+        self.verified = 0
+        self._positions_by_employee = {}
+        self._positions_by_user = {}
+        self.skills = SkillIndex()
+
+    def __len__(self):
+        return self.alive.bit_count()
+
+    @staticmethod
+    def _add(index, key, bit):
+        index[key] = index.get(key, 0) | bit
+
+    def _append(self, record):
+        position = len(self.rows)
+        bit = 1 << position
+        row = {key: record[key] for key in ROW_KEYS}
+        row["employee_id"] = str(row["employee_id"])
+        row["technologies"] = list(row["technologies"] or [])
+        row["interests"] = list(row["interests"] or [])
+        row["languages"] = list(row["languages"] or [])
+        self.rows.append(row)
+        self.skills.add(row)
+        self.alive |= bit
+
+        self._add(self.by_role, row["role"], bit)
+        self._add(self.by_area, row["technical_area"], bit)
+        self._add(self.by_level, row["role_level"], bit)
+        self._add(self.by_sfia, row["sfia_level"], bit)
+        self._add(self.by_availability, row["availability"], bit)
+        for technology in row["technologies"]:
+            self._add(self.by_technology, technology, bit)
+        if record["verification_status"] == APPROVED_VERIFICATION_STATUS:
+            self.verified |= bit
+        self._positions_by_employee.setdefault(row["employee_id"], []).append(position)
+        self._positions_by_user.setdefault(str(record["user_id"]), []).append(position)
+
+    def load(self, records):
+        """Replaces the snapshot with freshly queried index rows."""
+        self._reset()
+        for record in records:
+            self._append(record)
+        self.loaded_at = self.synced_at = time.time()
+
+    def apply_changes(self, employee_ids, user_ids, records):
+        """
+        Drops every row of the changed employees/users and appends their
+        current rows. Dead positions are only reclaimed on the next load.
+        """
+        dead = 0
+        for employee_id in employee_ids:
+            for position in self._positions_by_employee.pop(str(employee_id), []):
+                dead |= 1 << position
+        for user_id in user_ids:
+            for position in self._positions_by_user.pop(str(user_id), []):
+                dead |= 1 << position
+                self._positions_by_employee.pop(self.rows[position]["employee_id"], None)
+        self.alive &= ~dead
+        self.skills.remove(list(_positions(dead)))
+        for record in records:
+            self._append(record)
+
+    def is_fresh(self, max_staleness_s):
+        return self.synced_at is not None and time.time() - self.synced_at <= max_staleness_s
+
+    def _any_of(self, index, keys):
+        bits = 0
+        for key in keys:
+            bits |= index.get(key, 0)
+        return bits
+
+    def _sfia_at_least(self, level):
+        return self._any_of(self.by_sfia, [key for key in self.by_sfia if key is not None and key >= level])
+
+    def _sfia_order(self):
+        # ORDER BY sfia_level DESC puts NULLs first
+        return [None] + sorted((key for key in self.by_sfia if key is not None), reverse=True)
+
+    def _take(self, mask, limit):
+        """Rows in the mask, highest SFIA first, up to limit."""
+        rows = []
+        for level in self._sfia_order():
+            for position in _positions(mask & self.by_sfia.get(level, 0)):
+                rows.append(dict(self.rows[position]))
+                if len(rows) == limit:
+                    return rows
+        return rows
+
+    def generation_candidates(self, requirements, technologies, min_sfia_level, availability, limit=20):
+        """Same filters and order as the generation_candidates query."""
+        mask = self.alive & self.verified & self.by_availability.get(bool(availability), 0)
+        if min_sfia_level is not None:
+            mask &= self._sfia_at_least(min_sfia_level)
+
+        requirement_bits = 0
+        has_requirements = False
+        for req in requirements:
+            level = parse_level(req.get("Level"))
+            if not (req.get("Role") and req.get("Area") and level):
+                continue
+            has_requirements = True
+            requirement_bits |= (
+                self.by_role.get(req["Role"], 0)
+                & self._any_of(self.by_area, split_areas(req.get("Area")))
+                & self.by_level.get(level, 0)
+            )
+        if has_requirements:
+            mask &= requirement_bits
+        if technologies:
+            mask &= self._any_of(self.by_technology, technologies)
+        return self._take(mask, limit)
+
+    def team_candidates(self, member_ids, role, area, level_name, technologies, limit=15, members=()):
+        """
+        The team_search query's role, area and level filters, but ranked
+        by skill similarity to the requested technologies and areas and to
+        the gaps and interests of `members` (the team's member dicts)
+        instead of requiring one of the technologies.
+        """
+        mask = self.alive
+        for member_id in member_ids:
+            for position in self._positions_by_employee.get(str(member_id), []):
+                mask &= ~(1 << position)
+        if role:
+            mask &= self.by_role.get(role, 0)
+        areas = split_areas(area)
+        if areas:
+            mask &= self._any_of(self.by_area, areas)
+        level = parse_level(level_name)
+        if level:
+            mask &= self.by_level.get(level, 0)
+
+        query = self.skills.query(technologies, areas, members)
+        positions = self.skills.top_k(bits_to_mask(mask, len(self.rows)), query, limit)
+        requested = normalized_technologies(technologies)
+        rows = []
+        for position in positions:
+            row = dict(self.rows[position])
+            row["has_required_tech"] = not requested.isdisjoint(normalized_technologies(row["technologies"]))
+            rows.append(row)
+        return rows
+
+    def get_stats(self):
+        return {
+            "rows": len(self),
+            "dead_rows": len(self.rows) - len(self),
+            "employees": len(self._positions_by_employee),
+            "technologies": len(self.by_technology),
+            "skills": self.skills.get_stats(),
+            "loaded_at": self.loaded_at,
+            "synced_at": self.synced_at,
+            "staleness_s": time.time() - self.synced_at if self.synced_at else None,
+        }
+
+
+class CandidateIndexSync:
+    """Loads the index and keeps it current from Postgres notifications."""
+
+    def __init__(self, db_service, index, dsn, max_staleness_s=30.0, reload_s=3600.0, batch_s=0.5):
+        self.db_service = db_service
+        self.index = index
+        self.dsn = dsn
+        self.max_staleness_s = max_staleness_s
+        self.reload_s = reload_s
+        self.batch_s = batch_s
+        self._listener = None
+        self._pending_employees = set()
+        self._pending_users = set()
+        self._task = None
+        self.notifications = 0
+        self.last_error = None
+        self.missing_triggers = []
+
+    @classmethod
+    def from_settings(cls, db_service, index, settings):
+        return cls(
+            db_service,
+            index,
+            settings.database_url,
+            max_staleness_s=settings.candidate_index_max_staleness_s,
+            reload_s=settings.candidate_index_reload_s,
+        )
+
+    async def _fetch_index_rows(self, employee_ids=None, user_ids=None):
+        # Always read live data: the materialized view may lag behind
+        return await self.db_service._fetch_all(
+            LIVE_PROFILE_QUERIES["index_rows"],
+            {"employee_ids": employee_ids, "user_ids": user_ids},
+            label="index_rows",
+        )
+
+    async def reload(self):
+        self.index.load(await self._fetch_index_rows())
+
+    async def start(self):
+        try:
+            await self._open_listener()
+        except Exception as e:
+            # Without the feed the snapshot only serves reads until it goes stale
+            self.last_error = str(e)
+            logger.warning("Candidate index change feed unavailable: %s", e)
+            await self.reload()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        await self._close_listener()
+
+    def request_changes(self, employee_ids=(), user_ids=()):
+        """Queues employees/users to re-read (change feed or backend webhook)."""
+        self._pending_employees.update(str(i) for i in employee_ids)
+        self._pending_users.update(str(i) for i in user_ids)
+
+    def _on_notification(self, connection, pid, channel, payload):
+        self.notifications += 1
+        kind, _, identifier = payload.partition(":")
+        if kind == "user":
+            self._pending_users.add(identifier)
+        else:
+            self._pending_employees.add(identifier)
+
+    async def _missing_triggers(self, connection):
+        """Watched tables without the backend's change-notification trigger."""
+        rows = await connection.fetch(
+            "SELECT c.relname FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE t.tgname = $1 AND n.nspname = 'public' AND NOT t.tgisinternal",
+            NOTIFY_TRIGGER,
+        )
+        installed = {row["relname"] for row in rows}
+        return [table for table in WATCHED_TABLES if table not in installed]
+
+    async def _open_listener(self):
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            await connection.add_listener(NOTIFY_CHANNEL, self._on_notification)
+            self.missing_triggers = await self._missing_triggers(connection)
+        except Exception:
+            await connection.close()
+            raise
+        self._listener = connection
+        if self.missing_triggers:
+            logger.warning(
+                "Candidate index change feed has no %s trigger on %s; apply the backend migration "
+                "EmployeeMatchChangeNotifications. Changes there go unnoticed, so the index is not "
+                "reported fresh and searches fall back to SQL",
+                NOTIFY_TRIGGER, ", ".join(self.missing_triggers),
+            )
+        # Loaded after LISTEN so no change falls between the snapshot and the feed
+        await self.reload()
+
+    async def _close_listener(self):
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            try:
+                await listener.close()
+            except Exception:
+                pass
+
+    async def _apply_pending(self):
+        if not (self._pending_employees or self._pending_users):
+            return
+        employee_ids, self._pending_employees = sorted(self._pending_employees), set()
+        user_ids, self._pending_users = sorted(self._pending_users), set()
+        records = await self._fetch_index_rows(employee_ids or [], user_ids or [])
+        self.index.apply_changes(employee_ids, user_ids, records)
+
+    async def _run(self):
+        while True:
+            try:
+                await self._apply_pending()
+                if self._listener is None or self._listener.is_closed():
+                    await self._close_listener()
+                    await self._open_listener()
+                if time.time() - (self.index.loaded_at or 0) > self.reload_s:
+                    if self.missing_triggers:
+                        self.missing_triggers = await self._missing_triggers(self._listener)
+                    await self.reload()
+                if not self.missing_triggers:
+                    # The feed is connected and everything it reported is applied
+                    self.index.synced_at = time.time()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.last_error != str(e):
+                    logger.warning("Candidate index sync failed: %s", e)
+                self.last_error = str(e)
+                await self._close_listener()
+                await asyncio.sleep(RETRY_DELAY_S)
+            await asyncio.sleep(self.batch_s)
+
+    def get_stats(self):
+        return {
+            **self.index.get_stats(),
+            "fresh": self.index.is_fresh(self.max_staleness_s),
+            "max_staleness_s": self.max_staleness_s,
+            "listening": self._listener is not None and not self._listener.is_closed(),
+            "notifications": self.notifications,
+            "missing_triggers": self.missing_triggers,
+            "pending": len(self._pending_employees) + len(self._pending_users),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,280 @@
+"""
+Precomputed pairwise compatibility of people on the interpersonal criteria.
+
+MBTI complementarity, working-hours overlap and shared interests or
+languages only depend on the values two people hold, so they are looked up
+instead of recomputed for every pair:
+
+- MBTI_TABLE scores the 16 types against each other, plus an "unknown"
+  row and column at 0.5.
+- Timezones are reduced to their UTC offset (zoneinfo) and interned; the
+  overlap table between every offset seen so far grows with them.
+- Interests and languages become bitsets over a process-wide vocabulary,
+  so a Jaccard similarity or a "shares a language" test is a popcount.
+  Each batch keeps its distinct sets only, so the table between two
+  batches has one row per distinct set rather than per person.
+
+`encode_people` turns rows into those codes once; `compatibility_matrix`
+then builds the whole candidates x members matrix by indexing the tables,
+and `mean_compatibility` reduces it against a reference group without
+materializing it.
+"""
+import threading
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+# Interpersonal criteria scored for each pair of people, in this column order
+PAIRWISE_CRITERIA = ("psychological", "language", "interests", "timezone")
+
+# Hours of a working day used to compute timezone overlap
+WORKDAY_HOURS = 9.0
+
+MBTI_TYPES = tuple(e + n + t + j for e in "EI" for n in "NS" for t in "TF" for j in "JP")
+UNKNOWN_MBTI = len(MBTI_TYPES)
+_MBTI_CODES = {code: index for index, code in enumerate(MBTI_TYPES)}
+
+# Bitset cells (pairs x 64-bit words) compared per chunk, to bound memory
+_CHUNK_CELLS = 1 << 20
+
+
+def _mbti_bits(mbti):
+    """Encodes an MBTI type as four 0/1 dichotomies (E, N, T, J); unknown types are NaN."""
+    code = (mbti or "").strip().upper()[:4]
+    if len(code) != 4 or code[0] not in "EI" or code[1] not in "NS" or code[2] not in "TF" or code[3] not in "JP":
+        return [np.nan] * 4
+    return [code[0] == "E", code[1] == "N", code[2] == "T", code[3] == "J"]
+
+
+@lru_cache(maxsize=512)
+def utc_offset_hours(tz_name):
+    if not tz_name:
+        return np.nan
+    try:
+        offset = datetime.now(dt_timezone.utc).astimezone(ZoneInfo(tz_name)).utcoffset()
+    except (ZoneInfoNotFoundError, ValueError):
+        return np.nan
+    return offset.total_seconds() / 3600.0
+
+
+def mbti_complementarity(a_bits, b_bits):
+    """
+    Pairwise personality complementarity for two (n, 4) / (m, 4) MBTI arrays.
+
+    Sharing the perception axis (N/S) eases communication, while differing on
+    energy (E/I), decisions (T/F) and structure (J/P) brings complementary
+    strengths; each of the four contributes a quarter. Unknown types get 0.5.
+    """
+    same = (a_bits[:, None, :] == b_bits[None, :, :]).astype(float)
+    score = (same[..., 1] + (1.0 - same[..., 0]) + (1.0 - same[..., 2]) + (1.0 - same[..., 3])) / 4.0
+    unknown = np.isnan(a_bits).any(axis=1)[:, None] | np.isnan(b_bits).any(axis=1)[None, :]
+    return np.where(unknown, 0.5, score)
+
+
+def timezone_overlap(a_offsets, b_offsets):
+    """
+    Share of a working day two people overlap given their UTC offsets;
+    unknown offsets get 0.5. Offsets are compared around the clock, so
+    UTC-10 and UTC+14 share the whole day.
+    """
+    diff = np.abs(a_offsets[:, None] - b_offsets[None, :]) % 24.0
+    diff = np.minimum(diff, 24.0 - diff)
+    overlap = np.clip(WORKDAY_HOURS - diff, 0.0, WORKDAY_HOURS) / WORKDAY_HOURS
+    return np.where(np.isnan(overlap), 0.5, overlap)
+
+
+def mbti_code(mbti) -> int:
+    return _MBTI_CODES.get((mbti or "").strip().upper()[:4], UNKNOWN_MBTI)
+
+
+MBTI_TABLE = mbti_complementarity(
+    np.array([_mbti_bits(code) for code in MBTI_TYPES + ("",)], dtype=float),
+    np.array([_mbti_bits(code) for code in MBTI_TYPES + ("",)], dtype=float),
+)
+
+
+class _TimezoneTable:
+    """Interned UTC offsets and the overlap between each pair of them; code 0 is unknown."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names = {}
+        self._offsets = {}
+        self.table = np.full((1, 1), 0.5)
+
+    def codes(self, names) -> np.ndarray:
+        with self._lock:
+            grew = False
+            codes = np.empty(len(names), dtype=np.intp)
+            for i, name in enumerate(names):
+                code = self._names.get(name)
+                if code is None:
+                    offset = utc_offset_hours(name)
+                    if np.isnan(offset):
+                        code = 0
+                    else:
+                        code = self._offsets.get(offset)
+                        if code is None:
+                            code = self._offsets[offset] = len(self._offsets) + 1
+                            grew = True
+                    self._names[name] = code
+                codes[i] = code
+            if grew:
+                offsets = np.array([np.nan, *self._offsets], dtype=float)
+                self.table = timezone_overlap(offsets, offsets)
+            return codes
+
+
+class _Vocabulary:
+    """Process-wide bit of every interest or language seen, also keyed by its raw spellings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._positions = {}
+        self._bits = {}
+
+    def _bit(self, value) -> int:
+        if not value:
+            return 0
+        with self._lock:
+            key = str(value).strip().lower()
+            bit = 1 << self._positions.setdefault(key, len(self._positions))
+            self._bits[value] = bit
+            return bit
+
+    def mask(self, values) -> int:
+        mask = 0
+        for value in values or ():
+            bit = self._bits.get(value)
+            mask |= self._bit(value) if bit is None else bit
+        return mask
+
+
+TIMEZONES = _TimezoneTable()
+INTERESTS = _Vocabulary()
+LANGUAGES = _Vocabulary()
+
+
+class _Bitsets:
+    """The distinct sets of a batch as (k, words) uint64 bitsets, and each person's row among them."""
+
+    def __init__(self, masks):
+        index = {}
+        self.inverse = np.array([index.setdefault(mask, len(index)) for mask in masks], dtype=np.intp)
+        self.masks = list(index)
+        self._arrays = {}
+
+    def words(self) -> int:
+        return max((max(self.masks, default=0).bit_length() + 63) // 64, 1)
+
+    def array(self, words):
+        if words not in self._arrays:
+            data = b"".join(mask.to_bytes(8 * words, "little") for mask in self.masks)
+            self._arrays[words] = np.frombuffer(data, dtype="<u8").reshape(len(self.masks), words)
+        return self._arrays[words]
+
+    def sizes(self, words):
+        return np.bitwise_count(self.array(words)).sum(axis=1)
+
+
+class PeopleCodes:
+    """Lookup codes of a list of people, in their order."""
+
+    def __init__(self, people):
+        self.mbti = np.array([mbti_code(p.get("mbti")) for p in people], dtype=np.intp)
+        self.timezone = TIMEZONES.codes([p.get("timezone") for p in people])
+        languages = [LANGUAGES.mask(p.get("languages")) for p in people]
+        self.language_counts = np.array([mask.bit_count() for mask in languages], dtype=float)
+        self.languages = _Bitsets(languages)
+        self.interests = _Bitsets([INTERESTS.mask(p.get("interests")) for p in people])
+
+    def __len__(self):
+        return len(self.mbti)
+
+
+def encode_people(people) -> PeopleCodes:
+    return people if isinstance(people, PeopleCodes) else PeopleCodes(people)
+
+
+def _bitset_table(a, b, jaccard):
+    """Jaccard similarity (or 1.0 if they intersect) between the distinct sets of two batches."""
+    words = max(a.words(), b.words())
+    a_bits, b_bits = a.array(words), b.array(words)
+    table = np.empty((len(a.masks), len(b.masks)))
+    if jaccard:
+        a_sizes, b_sizes = a.sizes(words), b.sizes(words)
+    step = max(_CHUNK_CELLS // max(len(b.masks) * words, 1), 1)
+    for start in range(0, len(a.masks), step):
+        stop = start + step
+        common = a_bits[start:stop, None, :] & b_bits[None, :, :]
+        if not jaccard:
+            table[start:stop] = common.any(axis=2)
+            continue
+        intersection = np.bitwise_count(common).sum(axis=2)
+        union = a_sizes[start:stop, None] + b_sizes[None, :] - intersection
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table[start:stop] = np.where(union > 0, intersection / union, 0.0)
+    return table
+
+
+def _lookup(criterion, a, b):
+    """(table, a_codes, b_codes) such that `criterion` of a[i] with b[j] is table[a_codes[i], b_codes[j]]."""
+    if criterion == "psychological":
+        return MBTI_TABLE, a.mbti, b.mbti
+    if criterion == "timezone":
+        return TIMEZONES.table, a.timezone, b.timezone
+    if criterion == "language":
+        return _bitset_table(a.languages, b.languages, jaccard=False), a.languages.inverse, b.languages.inverse
+    return _bitset_table(a.interests, b.interests, jaccard=True), a.interests.inverse, b.interests.inverse
+
+
+def compatibility_matrix(candidates, members, weights=None):
+    """
+    Every candidate paired with every member on PAIRWISE_CRITERIA.
+
+    Returns a (len(candidates), len(members), 4) array, or with `weights`
+    (one per criterion) their weighted (len(candidates), len(members)) sum.
+    Either side may be a list of person dicts or their PeopleCodes.
+    """
+    a = encode_people(candidates)
+    b = a if members is candidates else encode_people(members)
+    if weights is None:
+        matrix = np.empty((len(a), len(b), len(PAIRWISE_CRITERIA)))
+    else:
+        matrix = np.zeros((len(a), len(b)))
+    for c, criterion in enumerate(PAIRWISE_CRITERIA):
+        if weights is not None and not weights[c]:
+            continue
+        table, a_codes, b_codes = _lookup(criterion, a, b)
+        if weights is None:
+            matrix[:, :, c] = table.take(a_codes, axis=0).take(b_codes, axis=1)
+        else:
+            # Weighting the small table first keeps the full-size work to one gather and one add
+            matrix += (weights[c] * table).take(a_codes, axis=0).take(b_codes, axis=1)
+    return matrix
+
+
+def mean_compatibility(candidates, reference, exclude_self=False):
+    """
+    Mean score of each candidate against the reference group, a
+    (len(candidates), 4) array, or None when the group is empty. With
+    `exclude_self` the candidates are the reference group itself and each
+    one's pairing with themselves is left out. Costs one table lookup per
+    candidate and criterion, whatever the size of the group.
+    """
+    a = encode_people(candidates)
+    b = a if exclude_self else encode_people(reference)
+    m = len(b)
+    if m == 0 or (exclude_self and m < 2):
+        return None
+    means = np.empty((len(a), len(PAIRWISE_CRITERIA)))
+    for c, criterion in enumerate(PAIRWISE_CRITERIA):
+        table, a_codes, b_codes = _lookup(criterion, a, b)
+        totals = table @ np.bincount(b_codes, minlength=table.shape[1])
+        if exclude_self:
+            means[:, c] = (totals[a_codes] - table[a_codes, a_codes]) / (m - 1)
+        else:
+            means[:, c] = totals[a_codes] / m
+    return means
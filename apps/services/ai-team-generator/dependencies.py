@@ -0,0 +1,32 @@
+from fastapi import Request
+
+from jobs import JobManager
+from llm_client import LLMClient
+from result_cache import ResultCache
+from team_db_service import TeamDatabaseService
+from team_state import TeamStateStore
+
+
+def get_db_service(request: Request) -> TeamDatabaseService:
+    """Returns the pooled database service created in the app lifespan."""
+    return request.app.state.db_service
+
+
+def get_llm_client(request: Request) -> LLMClient:
+    """Returns the shared async LLM client created in the app lifespan."""
+    return request.app.state.llm_client
+
+
+def get_result_cache(request: Request) -> ResultCache:
+    """Returns the in-memory result cache created in the app lifespan."""
+    return request.app.state.result_cache
+
+
+def get_team_state_store(request: Request) -> TeamStateStore:
+    """Returns the per-team reanalysis state created in the app lifespan."""
+    return request.app.state.team_states
+
+
+def get_job_manager(request: Request) -> JobManager:
+    """Returns the generation job manager created in the app lifespan."""
+    return request.app.state.job_manager
@@ -1,12 +1,15 @@
 import asyncio
 
 import json
+import logging
 import os
 
 from langchain_anthropic import ChatAnthropic
 from dotenv import load_dotenv
 from mcp_use import MCPClient, MCPAgent
 
+logger = logging.getLogger(__name__)
+
 
 async def ask_ia(prompt):
     load_dotenv()
@@ -42,7 +45,7 @@ async def ask_ia(prompt):
             max_steps=30,
         )
         if not result:
-            print("La consulta no devolvió resultados")
+            logger.warning("La consulta no devolvió resultados")
             return None
 
         try:
@@ -50,11 +53,11 @@ async def ask_ia(prompt):
                 return json.loads(result)
             return result
         except json.JSONDecodeError as e:
-            print(f"Error decodificando JSON: {e}")
+            logger.warning("Error decodificando JSON: %s", e)
             return None
 
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.exception("An error occurred: %s", e)
         return None
     finally:
         if client.sessions:
@@ -0,0 +1,196 @@
+"""
+Asynchronous generation jobs.
+
+POST /jobs/generate-teams only queues the work and answers with a job id;
+a fixed pool of worker tasks runs the same generation as /generate-teams.
+Clients poll GET /jobs/{id} or subscribe to /jobs/{id}/ws to receive every
+status change. A request sent again with the same Idempotency-Key
+reattaches to the existing job instead of starting a new generation, which
+is what the backend's retries need after an HTTP timeout.
+
+Jobs live in memory on this worker and are dropped `ttl_s` seconds after
+they finish.
+"""
+import asyncio
+import time
+import uuid
+
+from result_cache import _stable_hash
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class IdempotencyConflict(Exception):
+    """The Idempotency-Key was already used for a different request."""
+
+
+class Job:
+    def __init__(self, params, fingerprint, idempotency_key=None):
+        self.id = str(uuid.uuid4())
+        self.params = params
+        self.fingerprint = fingerprint
+        self.idempotency_key = idempotency_key
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._subscribers = set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    def _publish(self):
+        snapshot = self.to_dict()
+        for queue in self._subscribers:
+            queue.put_nowait(snapshot)
+
+
+class JobManager:
+    """
+    In-memory job registry with a bounded queue and `workers` worker tasks.
+
+    `runner` is the coroutine function that does the work: it receives the
+    job params and returns the result. Exceptions carrying `status_code` and
+    `detail` (HTTPException) are reported as they are; any other exception
+    becomes a 500 error.
+    """
+
+    def __init__(self, runner, workers=4, max_queued=100, ttl_s=3600.0):
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl_s = ttl_s
+        self._jobs = {}
+        self._by_key = {}
+        self._queue = asyncio.Queue()
+        self._tasks = []
+        self.submitted = 0
+        self.reattached = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.run_time_s = 0.0
+
+    @classmethod
+    def from_settings(cls, runner, settings):
+        return cls(runner, workers=settings.job_workers, max_queued=settings.job_max_queued, ttl_s=settings.job_ttl_s)
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, params, idempotency_key=None):
+        """
+        Queues a job and returns (job, created). With a known idempotency key
+        the existing job is returned and nothing is queued.
+        """
+        self._prune()
+        fingerprint = _stable_hash(params)
+        if idempotency_key is not None and idempotency_key in self._by_key:
+            job = self._jobs[self._by_key[idempotency_key]]
+            if job.fingerprint != fingerprint:
+                raise IdempotencyConflict(idempotency_key)
+            self.reattached += 1
+            return job, False
+
+        if self._queue.qsize() >= self.max_queued:
+            self.rejected += 1
+            raise JobQueueFull()
+
+        job = Job(params, fingerprint, idempotency_key)
+        self._jobs[job.id] = job
+        if idempotency_key is not None:
+            self._by_key[idempotency_key] = job.id
+        self._queue.put_nowait(job.id)
+        self.submitted += 1
+        return job, True
+
+    def get(self, job_id):
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def subscribe(self, job):
+        """Queue that receives a snapshot of the job on every status change."""
+        queue = asyncio.Queue()
+        job._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, job, queue):
+        job._subscribers.discard(queue)
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl_s
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if job.idempotency_key is not None:
+                self._by_key.pop(job.idempotency_key, None)
+
+    async def _work(self):
+        while True:
+            job = self._jobs.get(await self._queue.get())
+            if job is None:
+                continue
+            job.status, job.started_at = RUNNING, time.time()
+            job._publish()
+            try:
+                job.result = await self.runner(job.params)
+                job.status = SUCCEEDED
+                self.succeeded += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error = {
+                    "status_code": getattr(e, "status_code", 500),
+                    "detail": getattr(e, "detail", None) or str(e),
+                }
+                job.status = FAILED
+                self.failed += 1
+            job.finished_at = time.time()
+            self.run_time_s += job.finished_at - job.started_at
+            job._publish()
+
+    def get_stats(self):
+        finished = self.succeeded + self.failed
+        states = {}
+        for job in self._jobs.values():
+            states[job.status] = states.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "max_queued": self.max_queued,
+            "jobs": states,
+            "submitted": self.submitted,
+            "reattached": self.reattached,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_run_time_s": self.run_time_s / finished if finished else 0.0,
+        }
@@ -0,0 +1,187 @@
+"""
+Extraction of the structured answer of a model call.
+
+Every endpoint forces the model to answer through its output tool
+(output_schemas), so the answer is the tool's input JSON rather than free
+text. The call is streamed and the raw `input_json_delta` fragments are fed
+to an IncrementalJSONParser. When the answer is cut by max_tokens, a
+follow-up call shows the model the tool input written so far and asks for
+only the rest, which is fed to the same parser (no assistant prefill: the
+cut-off input is an earlier turn and the last message is the request). If
+the value is still not closed, the complete elements are salvaged and the
+unfinished tail is dropped. The value is then validated into the tool's
+Pydantic model.
+
+Every answer is counted in teamgen_json_extractions_total by how it was
+obtained.
+"""
+import json
+import logging
+import time
+
+from anthropic import APIError
+from pydantic import ValidationError
+
+from observability import JSON_EXTRACTIONS, LLM_CONTINUATIONS, PARSE_SECONDS, current_endpoint, observe_first_token, set_outcome, timed
+from streaming_json import IncrementalJSONParser
+from token_budget import UsageCapExceeded
+
+CLEAN = "clean"
+CONTINUED = "continued"
+SALVAGED = "salvaged"
+INVALID = "invalid"
+FAILED = "failed"
+
+CONTINUATION_NOTE = "[Respuesta cortada por el límite de tokens]"
+CONTINUATION_REQUEST = (
+    "Tu respuesta anterior se cortó por el límite de tokens. Escribe solo el resto del JSON de la "
+    "herramienta, empezando exactamente en el carácter siguiente al último que escribiste: sin "
+    "repetir nada, sin bloques de código y sin texto adicional."
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JSONExtractionError(ValueError):
+    pass
+
+
+def record_extraction(result):
+    JSON_EXTRACTIONS.labels(endpoint=current_endpoint(), result=result).inc()
+
+
+def response_text(message) -> str:
+    """The text blocks of a message, e.g. the explanation of a refusal."""
+    return "".join(block.text for block in message.content if getattr(block, "type", None) == "text")
+
+
+def tool_input_delta(event) -> str:
+    """The raw tool input JSON carried by a stream event, or ""."""
+    if event.type == "content_block_delta" and event.delta.type == "input_json_delta":
+        return event.delta.partial_json
+    return ""
+
+
+async def call_tool(llm_client, **call):
+    """
+    Runs a forced tool call as a stream; returns the final message and the
+    parser fed with the tool input as it arrived. Observes the time to the
+    first content delta.
+    """
+    parser = IncrementalJSONParser([()])
+    started = time.perf_counter()
+    first_token = True
+    async with llm_client.stream_message(**call) as stream:
+        async for event in stream:
+            if first_token and event.type == "content_block_delta":
+                observe_first_token(started, call.get("model"))
+                first_token = False
+            fragment = tool_input_delta(event)
+            if fragment:
+                parser.feed(fragment)
+        message = await stream.get_final_message()
+    return message, parser
+
+
+def continuation_call(call, partial):
+    """
+    `call` asking for the rest of the tool input `partial`, cut by max_tokens.
+    The input goes back as an earlier assistant turn followed by the request,
+    and the answer is plain text: the tools stay (their cached prefix still
+    matches) but none is forced.
+    """
+    return {
+        **call,
+        "tool_choice": {"type": "none"},
+        "messages": [
+            *call["messages"],
+            {"role": "assistant", "content": f"{CONTINUATION_NOTE}\n{partial}"},
+            {"role": "user", "content": CONTINUATION_REQUEST},
+        ],
+    }
+
+
+def _strip_fence(head):
+    """
+    `head` without a leading markdown fence line, or None while the text is
+    too short to tell whether it starts with one.
+    """
+    if head.startswith("```"):
+        return head.split("\n", 1)[1] if "\n" in head else None
+    if len(head) < 3 and "```".startswith(head):
+        return None
+    return head
+
+
+async def continue_tool_input(llm_client, call, parser, max_continuations, responses):
+    """
+    Feeds `parser`, holding a tool input cut by max_tokens, the rest of it
+    with up to `max_continuations` follow-up calls and yields the (path,
+    value) events it completes. Stops early when the value is closed or a
+    continuation does not fit the text so far; the parser can still salvage
+    what was complete. The final message of every follow-up call is appended
+    to `responses`.
+    """
+    for _ in range(max_continuations):
+        if parser.done or not parser.text:
+            return
+        LLM_CONTINUATIONS.labels(endpoint=current_endpoint(), model=call.get("model")).inc()
+        head = ""
+        try:
+            async with llm_client.stream_message(**continuation_call(call, parser.text)) as stream:
+                async for event in stream:
+                    if event.type != "content_block_delta" or event.delta.type != "text_delta":
+                        continue
+                    text = event.delta.text
+                    if head is not None:
+                        head += text
+                        text = _strip_fence(head)
+                        if text is None:
+                            continue
+                        head = None
+                    for item in parser.feed(text):
+                        yield item
+                message = await stream.get_final_message()
+        except (ValueError, IndexError) as e:
+            logger.warning("Continuation of a truncated answer does not fit it: %s", e)
+            return
+        except (APIError, UsageCapExceeded) as e:
+            # The cut-off answer can still be salvaged
+            logger.warning("Continuation of a truncated answer failed: %s", e)
+            return
+        responses.append(message)
+        if message.stop_reason != "max_tokens":
+            return
+
+
+def validate_output(tool, value, result):
+    """Validates a complete or salvaged tool input; returns (model, result)."""
+    with timed("parse", PARSE_SECONDS, outcome="ok" if result == CLEAN else result) as parse:
+        try:
+            output = tool.validate(value)
+        except ValidationError as e:
+            parse["outcome"] = "parse_error"
+            set_outcome("parse_error")
+            record_extraction(INVALID)
+            raise JSONExtractionError(f"La respuesta de la IA no cumple el esquema de {tool.name}: {e}")
+    record_extraction(result)
+    return output, result
+
+
+def tool_output(tool, parser, continued=False):
+    """
+    The answer read by `parser`, validated into `tool`'s model. Returns
+    (model, CLEAN, CONTINUED when `continued` calls completed it, or
+    SALVAGED); raises JSONExtractionError when nothing usable was received.
+    """
+    if parser.done:
+        return validate_output(tool, json.loads(parser.text[:parser.consumed]), CONTINUED if continued else CLEAN)
+    try:
+        value = parser.salvage()
+    except ValueError:
+        value = None
+    if not value:
+        set_outcome("parse_error")
+        record_extraction(FAILED)
+        raise JSONExtractionError("La respuesta de la IA no contiene un JSON completo")
+    return validate_output(tool, value, SALVAGED)
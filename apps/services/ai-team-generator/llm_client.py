@@ -0,0 +1,127 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from anthropic import AsyncAnthropic
+
+from model_router import DEFAULT_TIERS, ModelRouter
+from observability import LLM_SECONDS, current_endpoint, observe_prompt, set_outcome, stop_reason_outcome, timed
+from token_budget import UsageLedger
+
+
+class LLMClient:
+    """
+    Shared async Anthropic client for the whole worker.
+
+    Every model call goes through a semaphore so a burst of team generations
+    cannot open an unbounded number of requests; callers beyond the limit
+    wait their turn without blocking the event loop, so health checks and
+    database-only work keep being served.
+
+    Calls made with `creator=` are checked against and recorded in the
+    usage ledger. `router` picks the model tiers of each endpoint.
+    """
+
+    def __init__(
+        self, api_key, max_concurrency=8, timeout=120.0, max_retries=2, base_url=None, ledger=None, router=None
+    ):
+        self.client = AsyncAnthropic(api_key=api_key, timeout=timeout, max_retries=max_retries, base_url=base_url)
+        self.max_concurrency = max_concurrency
+        self.ledger = ledger or UsageLedger()
+        self.router = router or ModelRouter(DEFAULT_TIERS, {})
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+        self._failed = 0
+        self._slot_wait_total = 0.0
+        self._usage = {
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            api_key=settings.claude_api_key,
+            max_concurrency=settings.llm_max_concurrency,
+            timeout=settings.llm_timeout_s,
+            max_retries=settings.llm_max_retries,
+            base_url=settings.llm_base_url,
+            ledger=UsageLedger.from_settings(settings),
+            router=ModelRouter.from_settings(settings),
+        )
+
+    async def close(self):
+        await self.client.close()
+
+    @asynccontextmanager
+    async def _slot(self):
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._slot_wait_total += time.perf_counter() - started
+        self._in_flight += 1
+        try:
+            yield
+        except BaseException:
+            self._failed += 1
+            raise
+        else:
+            self._completed += 1
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def _record_usage(self, usage, creator=None):
+        self.ledger.record(current_endpoint(), creator, usage)
+        for key in self._usage:
+            self._usage[key] += getattr(usage, key, None) or 0
+
+    @staticmethod
+    def _record_outcome(labels, stop_reason):
+        labels["outcome"] = stop_reason_outcome(stop_reason)
+        if labels["outcome"] != "ok":
+            set_outcome(labels["outcome"])
+
+    @asynccontextmanager
+    async def stream_message(self, creator=None, **kwargs):
+        """Opens a streaming call; the concurrency slot is held until the stream is closed."""
+        self.ledger.check(creator)
+        observe_prompt(kwargs.get("messages") or [], kwargs.get("system") or [])
+        async with self._slot():
+            with timed("llm", LLM_SECONDS, outcome=None) as labels:
+                async with self.client.messages.stream(**kwargs) as stream:
+                    try:
+                        yield stream
+                    finally:
+                        try:
+                            snapshot = stream.current_message_snapshot
+                            self._record_usage(snapshot.usage, creator)
+                            if snapshot.stop_reason is not None:
+                                self._record_outcome(labels, snapshot.stop_reason)
+                        except AssertionError:
+                            # No message_start event was received
+                            pass
+
+    async def count_tokens(self, **kwargs) -> int:
+        """Input tokens for a prospective call; does not take a concurrency slot."""
+        result = await self.client.messages.count_tokens(**kwargs)
+        return result.input_tokens
+
+    def get_stats(self):
+        finished = self._completed + self._failed
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "completed": self._completed,
+            "failed": self._failed,
+            "slot_wait_avg_ms": self._slot_wait_total / finished * 1000 if finished else 0.0,
+            "usage": dict(self._usage),
+        }
@@ -0,0 +1,146 @@
+"""
+Builds /generate-teams responses for a team chosen by the optimizer.
+
+`build_team_response` merges the model's explanation into the chosen team.
+When the request asks for alternatives, `teams` lists the best team first
+followed by the optimizer's next-best distinct teams, each with its own
+`rank` and `compatibility_score`; the root-level leader and analysis always
+describe `teams[0]`.
+`build_local_team_response` needs no model at all and is used for
+`mode=local` and as a fallback when the model is unavailable: the leader is
+picked deterministically and the analysis texts are short summaries of the
+criterion scores.
+"""
+import uuid
+
+from scoring import CRITERIA
+
+CRITERIA_LABELS = {
+    "sfia": "nivel SFIA",
+    "technical": "cobertura tecnológica",
+    "psychological": "complementariedad de personalidades (MBTI)",
+    "experience": "experiencia en el rol",
+    "language": "idiomas en común",
+    "interests": "intereses compartidos",
+    "timezone": "solapamiento de zona horaria",
+}
+
+
+def _member(row):
+    return {
+        "id": str(row["employee_id"]),
+        "name": row.get("name"),
+        "role": row.get("role"),
+        "sfia_level": row.get("sfia_level"),
+    }
+
+
+def team_members_payload(assignment, scores):
+    return [_member(scores.rows[i]) for i in assignment.indices]
+
+
+def teams_payload(assignment, scores):
+    """The chosen team followed by its ranked alternatives."""
+    return [
+        {
+            "team_id": str(uuid.uuid4()),
+            "members": team_members_payload(team, scores),
+            "compatibility_score": int(round(team.score)),
+            "rank": rank,
+        }
+        for rank, team in enumerate([assignment] + list(assignment.alternatives), start=1)
+    ]
+
+
+def _local_leader(assignment, scores):
+    return max(
+        assignment.indices,
+        key=lambda i: (scores.rows[i].get("sfia_level") or 0, scores.totals[i]),
+    )
+
+
+def _team_criteria_means(scores, indices):
+    return {criterion: float(scores.matrix[indices, i].mean()) for i, criterion in enumerate(CRITERIA)}
+
+
+def _strengths_and_weaknesses(scores, indices):
+    means = _team_criteria_means(scores, indices)
+    weighted = sorted(
+        (c for i, c in enumerate(CRITERIA) if scores.weights[i] > 0),
+        key=lambda c: means[c],
+        reverse=True,
+    )
+    strengths = [
+        f"Punto fuerte en {CRITERIA_LABELS[c]}: el equipo obtiene {means[c] * 100:.0f}/100 en este criterio."
+        for c in weighted[:3]
+    ]
+    weaknesses = [
+        f"Mejorable en {CRITERIA_LABELS[c]}: el equipo obtiene {means[c] * 100:.0f}/100 en este criterio."
+        for c in reversed(weighted[-2:])
+        if means[c] < 0.7
+    ]
+    return strengths, weaknesses
+
+
+def build_team_response(assignment, scores, explanation):
+    """Combines the optimizer's team with the explanation written by the model."""
+    members = team_members_payload(assignment, scores)
+    leader = explanation.get("recommended_leader") or {}
+    if str(leader.get("id")) not in {member["id"] for member in members}:
+        # The leader must be a team member; fall back to the local choice
+        fallback = scores.rows[_local_leader(assignment, scores)]
+        leader = {
+            "id": str(fallback["employee_id"]),
+            "name": fallback.get("name"),
+            "rationale": leader.get("rationale", ""),
+        }
+
+    return {
+        "teams": teams_payload(assignment, scores),
+        "recommended_leader": leader,
+        "team_analysis": explanation.get("team_analysis") or {"strengths": [], "weaknesses": [], "compatibility": ""},
+        "compatibility_score": int(round(assignment.score)),
+        "recommended_Members": explanation.get("recommended_Members") or [],
+    }
+
+
+def build_local_team_response(assignment, scores, alternate_indices=()):
+    """Builds a response with the same shape as the model's without calling it."""
+    leader_index = _local_leader(assignment, scores)
+    leader = scores.rows[leader_index]
+    strengths, weaknesses = _strengths_and_weaknesses(scores, list(assignment.indices))
+    weight_summary = ", ".join(
+        f"{scores.weights[i] * 100:.0f}% {CRITERIA_LABELS[c]}" for i, c in enumerate(CRITERIA) if scores.weights[i] > 0
+    )
+
+    return {
+        "teams": teams_payload(assignment, scores),
+        "recommended_leader": {
+            "id": str(leader["employee_id"]),
+            "name": leader.get("name"),
+            "rationale": (
+                f"{leader.get('name')} tiene el nivel SFIA más alto del equipo ({leader.get('sfia_level')}) "
+                f"y una puntuación de compatibilidad de {scores.score(leader_index)}/100."
+            ),
+        },
+        "team_analysis": {
+            "strengths": strengths,
+            "weaknesses": weaknesses,
+            "compatibility": f"Selección calculada localmente con los pesos: {weight_summary}.",
+        },
+        "compatibility_score": int(round(assignment.score)),
+        "recommended_Members": [
+            {
+                "id": str(scores.rows[i]["employee_id"]),
+                "name": scores.rows[i].get("name"),
+                "compatibility_score": scores.score(i),
+                "analysis": "Candidato alternativo ordenado por puntuación local: "
+                + ", ".join(f"{CRITERIA_LABELS[c]} {v:.0f}" for c, v in scores.breakdown(i).items())
+                + ".",
+                "potential_conflicts": [],
+                "team_impact": "",
+            }
+            for i in alternate_indices
+        ],
+        "mode": "local",
+    }
@@ -0,0 +1,218 @@
+"""
+Model tier per endpoint, with cascade escalation.
+
+Each endpoint has a route: an ordered list of tiers ("fast", "large"). The
+first tier answers; an answer cut by max_tokens is first continued with
+follow-up calls to the same model. Its output is kept unless it fails
+schema validation, is still cut (salvaged) or the caller's `accept` check finds it
+unreliable (e.g. ids the prompt never contained), in which case the next
+tier is asked with the same call. The last tier's answer stands whatever it
+is. Refusals and context errors are returned to the caller as they are:
+a larger model would not change them.
+
+Every attempt is recorded per route and model (latency, tokens, estimated
+cost, why it was escalated) for GET /stats/model-routes.
+"""
+import collections
+import logging
+import time
+from types import SimpleNamespace
+
+from json_extraction import SALVAGED, JSONExtractionError, call_tool, continue_tool_input, tool_output
+from observability import LLM_ESCALATIONS
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens: input, output; cache writes cost 1.25x input and reads 0.1x
+PRICES = {
+    "claude-haiku-4-5-20251001": (1.0, 5.0),
+    "claude-sonnet-4-5-20250929": (3.0, 15.0),
+    "claude-opus-4-1-20250805": (15.0, 75.0),
+}
+DEFAULT_TIERS = {"fast": "claude-haiku-4-5-20251001", "large": "claude-sonnet-4-5-20250929"}
+FINAL_STOP_REASONS = ("refusal", "model_context_window_exceeded")
+LATENCY_SAMPLES = 1000
+USAGE_FIELDS = ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens")
+
+
+def call_cost(model, usage) -> float:
+    """Estimated USD of one call; 0 for a model without a known price."""
+    if usage is None or model not in PRICES:
+        return 0.0
+    input_price, output_price = PRICES[model]
+    tokens = (
+        (getattr(usage, "input_tokens", 0) or 0) * input_price
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0) * input_price * 1.25
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0) * input_price * 0.1
+        + (getattr(usage, "output_tokens", 0) or 0) * output_price
+    )
+    return tokens / 1_000_000
+
+
+def combined_usage(responses):
+    """The usage of several calls answering one request, e.g. an answer and its continuations."""
+    return SimpleNamespace(**{
+        field: sum(getattr(response.usage, field, 0) or 0 for response in responses) for field in USAGE_FIELDS
+    })
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ModelRouter:
+    """Resolves each endpoint's tiers to models and runs its cascade."""
+
+    def __init__(self, tiers, routes, max_continuations=0):
+        unknown = {tier for route in routes.values() for tier in route} - set(tiers)
+        if unknown:
+            raise ValueError(f"Unknown model tiers in routes: {sorted(unknown)}")
+        self.tiers = dict(tiers)
+        self.routes = {endpoint: tuple(route) for endpoint, route in routes.items()}
+        self.max_continuations = max_continuations
+        self._routes = {}
+        self._models = {}
+
+    @classmethod
+    def from_settings(cls, settings):
+        def route(value):
+            return [tier.strip() for tier in value.split(",") if tier.strip()]
+
+        return cls(
+            tiers={"fast": settings.llm_fast_model, "large": settings.llm_large_model},
+            routes={
+                "generate-teams": route(settings.llm_route_generate_teams),
+                "find-team-members": route(settings.llm_route_find_team_members),
+                "reanalyze-team": route(settings.llm_route_reanalyze_team),
+            },
+            max_continuations=settings.llm_max_continuations,
+        )
+
+    def models(self, endpoint) -> list[str]:
+        return [self.tiers[tier] for tier in self.routes.get(endpoint) or ("large",)]
+
+    def final_model(self, endpoint) -> str:
+        """The model whose answer stands, e.g. for a stream that cannot be escalated."""
+        return self.models(endpoint)[-1]
+
+    def all_models(self) -> list[str]:
+        return sorted({model for endpoint in self.routes for model in self.models(endpoint)})
+
+    def _model_entry(self, endpoint, model):
+        return self._models.setdefault((endpoint, model), {
+            "calls": 0,
+            "accepted": 0,
+            "escalated": collections.Counter(),
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cost_usd": 0.0,
+            "latency_s": collections.deque(maxlen=LATENCY_SAMPLES),
+        })
+
+    def record(self, endpoint, model, seconds, usage, escalation=None):
+        """Records one model call of `endpoint`; `escalation` is why its answer was not kept."""
+        entry = self._model_entry(endpoint, model)
+        entry["calls"] += 1
+        entry["latency_s"].append(seconds)
+        entry["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+        entry["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+        entry["cost_usd"] += call_cost(model, usage)
+        if escalation is None:
+            entry["accepted"] += 1
+        else:
+            entry["escalated"][escalation] += 1
+            LLM_ESCALATIONS.labels(endpoint=endpoint, model=model, reason=escalation).inc()
+
+    def _request(self, endpoint):
+        stats = self._routes.setdefault(endpoint, {"requests": 0, "escalated_requests": 0})
+        stats["requests"] += 1
+        return stats
+
+    def record_stream(self, endpoint, model, seconds, usage):
+        """Records a streamed answer, which always comes from the final tier."""
+        self._request(endpoint)
+        self.record(endpoint, model, seconds, usage)
+
+    async def run(self, llm_client, endpoint, tool, call, accept=None):
+        """
+        Runs `call` (a Messages API call without `model`) forcing `tool` down
+        `endpoint`'s cascade. Returns (response, output, extraction); output
+        and extraction are None when the response is a refusal or a context
+        error. `response` is the tier's first message: the continuations of a
+        truncated answer only add to its recorded usage. Raises
+        JSONExtractionError when the last tier's answer is unusable.
+        """
+        stats = self._request(endpoint)
+        models = self.models(endpoint)
+        for position, model in enumerate(models):
+            last = position == len(models) - 1
+            started = time.perf_counter()
+            response, parser = await call_tool(llm_client, model=model, **call)
+            responses = [response]
+            if response.stop_reason == "max_tokens":
+                continuations = continue_tool_input(
+                    llm_client, {**call, "model": model}, parser, self.max_continuations, responses
+                )
+                async for _ in continuations:
+                    pass
+            seconds = time.perf_counter() - started
+            usage = combined_usage(responses)
+
+            if response.stop_reason in FINAL_STOP_REASONS:
+                self.record(endpoint, model, seconds, usage)
+                return response, None, None
+            try:
+                output, extraction = tool_output(tool, parser, continued=len(responses) > 1)
+            except JSONExtractionError:
+                if last:
+                    self.record(endpoint, model, seconds, usage)
+                    raise
+                escalation = "invalid"
+            else:
+                if last:
+                    escalation = None
+                elif extraction == SALVAGED:
+                    escalation = "truncated"
+                elif accept is not None and not accept(output):
+                    escalation = "low_confidence"
+                else:
+                    escalation = None
+
+            self.record(endpoint, model, seconds, usage, escalation)
+            if escalation is None:
+                return response, output, extraction
+            if position == 0:
+                stats["escalated_requests"] += 1
+            logger.info("Escalating %s from %s (%s)", endpoint, model, escalation)
+
+    def get_stats(self):
+        routes = {}
+        for endpoint in sorted(set(self.routes) | set(self._routes)):
+            requests = self._routes.get(endpoint, {"requests": 0, "escalated_requests": 0})
+            models = {}
+            for model in self.models(endpoint):
+                entry = self._model_entry(endpoint, model)
+                latencies = list(entry["latency_s"])
+                models[model] = {
+                    "calls": entry["calls"],
+                    "accepted": entry["accepted"],
+                    "escalated": dict(entry["escalated"]),
+                    "latency_p50_ms": round(_percentile(latencies, 0.5) * 1000, 1),
+                    "latency_p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+                    "input_tokens": entry["input_tokens"],
+                    "output_tokens": entry["output_tokens"],
+                    "cost_usd": round(entry["cost_usd"], 6),
+                }
+            routes[endpoint] = {
+                "tiers": list(self.routes.get(endpoint) or ("large",)),
+                **requests,
+                "escalation_rate": (
+                    requests["escalated_requests"] / requests["requests"] if requests["requests"] else 0.0
+                ),
+                "cost_usd": round(sum(model["cost_usd"] for model in models.values()), 6),
+                "models": models,
+            }
+        return {"tiers": dict(self.tiers), "routes": routes}
@@ -0,0 +1,237 @@
+"""
+Logging setup, Prometheus metrics and Server-Timing headers.
+
+Code times a stage with `timed("db", DB_FETCH_SECONDS, query="team_data")`:
+the duration is observed in the histogram, labelled with the current
+endpoint, and added to the request's stage breakdown. `ServerTimingMiddleware`
+opens that breakdown for every HTTP request, writes it into the
+`Server-Timing` response header and observes the end-to-end histogram.
+Streaming responses send their headers before the model answers, so their
+header only covers the stages that ran before the first event.
+
+Log records are JSON lines (LOG_FORMAT=text for plain lines) carrying the
+id of the request they belong to: the caller's X-Request-ID, or a new one,
+echoed back in the response.
+
+Outcome labels: "ok", "refusal", "max_tokens", "context_exceeded",
+"parse_error", "unavailable" and "error"; parse time is also labelled
+"truncated" and "salvaged".
+"""
+import contextvars
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+from prompts import estimate_tokens
+
+TEXT_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+STOP_REASON_OUTCOMES = {
+    "end_turn": "ok",
+    "stop_sequence": "ok",
+    "tool_use": "ok",
+    "refusal": "refusal",
+    "max_tokens": "max_tokens",
+    "model_context_window_exceeded": "context_exceeded",
+}
+
+_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+DB_FETCH_SECONDS = Histogram(
+    "teamgen_db_fetch_seconds", "Database fetch time", ["endpoint", "query"], buckets=_SECONDS_BUCKETS
+)
+PROMPT_TOKENS = Histogram(
+    "teamgen_prompt_tokens",
+    "Estimated prompt size sent to the model",
+    ["endpoint"],
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000),
+)
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "teamgen_llm_first_token_seconds",
+    "Time from opening a model stream to its first content delta",
+    ["endpoint", "model"],
+    buckets=_SECONDS_BUCKETS,
+)
+LLM_SECONDS = Histogram(
+    "teamgen_llm_seconds", "Total model call time", ["endpoint", "outcome"], buckets=_SECONDS_BUCKETS
+)
+PARSE_SECONDS = Histogram(
+    "teamgen_parse_seconds", "Model answer cleaning and parsing time", ["endpoint", "outcome"], buckets=_SECONDS_BUCKETS
+)
+REQUEST_SECONDS = Histogram(
+    "teamgen_request_seconds", "End-to-end request time", ["endpoint", "outcome"], buckets=_SECONDS_BUCKETS
+)
+JSON_EXTRACTIONS = Counter(
+    "teamgen_json_extractions_total",
+    "Model answers by how their JSON was obtained (clean, continued, salvaged, invalid, failed)",
+    ["endpoint", "result"],
+)
+LLM_CONTINUATIONS = Counter(
+    "teamgen_llm_continuations_total",
+    "Follow-up calls that asked for the rest of an answer cut by max_tokens",
+    ["endpoint", "model"],
+)
+LLM_ESCALATIONS = Counter(
+    "teamgen_llm_escalations_total",
+    "Answers of a model tier that were passed on to the next tier, by reason",
+    ["endpoint", "model", "reason"],
+)
+
+
+class RequestMetrics:
+    """Stage durations and outcome of one request (or one background job)."""
+
+    def __init__(self, endpoint, request_id=None):
+        self.endpoint = endpoint
+        self.request_id = request_id
+        self.outcome = None
+        self.stages = {}
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def server_timing(self, total=None) -> str:
+        entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items()]
+        if total is not None:
+            entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON object per record, with the endpoint and id of the current request."""
+
+    def format(self, record):
+        metrics = _current.get()
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "endpoint": metrics.endpoint if metrics is not None else None,
+            "request_id": metrics.request_id if metrics is not None else None,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level="INFO", log_format="json"):
+    handler = logging.StreamHandler()
+    handler.setFormatter(JSONLogFormatter() if log_format == "json" else logging.Formatter(TEXT_LOG_FORMAT))
+    logging.basicConfig(level=str(level).upper(), handlers=[handler])
+
+
+def current_endpoint() -> str:
+    metrics = _current.get()
+    return metrics.endpoint if metrics is not None else "unknown"
+
+
+def observe_first_token(started, model):
+    """Observes the time since `started` (before the stream was opened) at its first content delta."""
+    LLM_FIRST_TOKEN_SECONDS.labels(endpoint=current_endpoint(), model=model).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def request_metrics(endpoint):
+    """Collects stages outside an HTTP request, e.g. in a job worker."""
+    metrics = RequestMetrics(endpoint)
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def set_outcome(outcome):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.outcome = outcome
+
+
+def stop_reason_outcome(stop_reason) -> str:
+    return STOP_REASON_OUTCOMES.get(stop_reason, "ok")
+
+
+@contextmanager
+def timed(stage, histogram=None, **labels):
+    """
+    Times a block as a Server-Timing stage and, when given, observes it in
+    `histogram` labelled with the current endpoint and `labels`. A label set
+    to None is filled in afterwards from the yielded dict, e.g. the outcome
+    of a model call that is only known once it returns.
+    """
+    result = dict(labels)
+    started = time.perf_counter()
+    try:
+        yield result
+    except Exception:
+        if result.get("outcome") is None and "outcome" in result:
+            result["outcome"] = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.add(stage, seconds)
+        if histogram is not None:
+            values = {key: value if value is not None else "ok" for key, value in result.items()}
+            histogram.labels(endpoint=current_endpoint(), **values).observe(seconds)
+
+
+def observe_prompt(messages, system_blocks=()):
+    """Records the estimated token count of a prompt about to be sent."""
+    if isinstance(system_blocks, str):
+        system_blocks = [{"text": system_blocks}]
+    text = "".join(block.get("text", "") for block in system_blocks)
+    text += "".join(message["content"] for message in messages if isinstance(message.get("content"), str))
+    PROMPT_TOKENS.labels(endpoint=current_endpoint()).observe(estimate_tokens(text))
+
+
+def metrics_payload():
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware so streamed responses are timed to their last byte."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1") or uuid.uuid4().hex
+        metrics = RequestMetrics(scope["path"], request_id)
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                header = metrics.server_timing(time.perf_counter() - started)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode("latin-1")),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None)
+            if endpoint is not None and endpoint != "/metrics":
+                outcome = metrics.outcome or ("ok" if status["code"] < 400 else "error")
+                REQUEST_SECONDS.labels(endpoint=endpoint, outcome=outcome).observe(time.perf_counter() - started)
@@ -0,0 +1,137 @@
+"""
+Output contracts of the model-backed endpoints.
+
+Each answer is declared once as a Pydantic model and offered to the model
+as the only tool it may call (`tool_choice` forces it), so the model fills
+a schema instead of being asked for "JSON puro". The tool input is then
+validated back into the same model. Field descriptions are read by the
+model; keep them in Spanish.
+
+The generated JSON schema marks every property as required so the model
+always fills the whole contract, while the Pydantic defaults let an answer
+cut by max_tokens still validate with the sections it completed.
+"""
+from pydantic import BaseModel, Field
+
+
+class LeaderChoice(BaseModel):
+    id: str = Field(description="Id corto de uno de los miembros del equipo seleccionado")
+    name: str = Field(description="Nombre de ese miembro")
+    rationale: str = Field(description="2-3 párrafos: por qué esta persona del equipo es el mejor líder")
+
+
+class TeamAnalysis(BaseModel):
+    strengths: list[str] = Field(
+        default_factory=list,
+        description="3 fortalezas: técnica (tecnologías y niveles SFIA), de competencias SFIA y de personalidades MBTI",
+    )
+    weaknesses: list[str] = Field(
+        default_factory=list,
+        description="3 debilidades concretas: una limitación real, un riesgo tecnológico y un riesgo operacional",
+    )
+    compatibility: str = Field(
+        default="",
+        description="100-150 palabras: cómo influyó cada peso, qué significa cada nivel SFIA y cómo se complementan las personalidades",
+    )
+
+
+class AlternateCandidate(BaseModel):
+    id: str = Field(description="Id corto del candidato alternativo")
+    name: str
+    compatibility_score: int = Field(ge=0, le=100, description="El mismo puntaje que trae el candidato")
+    analysis: str = Field(description="2-3 oraciones: nivel SFIA, stack clave, MBTI y por qué no fue seleccionado")
+    potential_conflicts: list[str] = Field(default_factory=list, description="Conflictos posibles, 1 oración cada uno")
+    team_impact: str = Field(default="", description="2-3 oraciones sobre su impacto técnico y de personalidad")
+
+
+class TeamExplanation(BaseModel):
+    recommended_leader: LeaderChoice
+    team_analysis: TeamAnalysis = Field(default_factory=TeamAnalysis)
+    recommended_Members: list[AlternateCandidate] = Field(
+        default_factory=list,
+        max_length=3,
+        description="Exactamente los candidatos alternativos proporcionados, nunca miembros del equipo",
+    )
+
+
+class CandidateRecommendation(BaseModel):
+    employee_id: str = Field(description="Id corto del candidato (columna id)")
+    name: str
+    role: str
+    area: str
+    technologies: list[str] = Field(default_factory=list, description="Nombres de tecnologías, nunca índices")
+    sfia_level: int
+    compatibility_score: int = Field(ge=0, le=100)
+    analysis: str = Field(description="2-4 oraciones: por qué sería una buena adición al equipo")
+
+
+class CandidateRecommendations(BaseModel):
+    candidates: list[CandidateRecommendation] = Field(
+        max_length=5, description="Los 5 mejores candidatos, de mayor a menor puntaje de compatibilidad"
+    )
+
+
+class TeamReanalysis(BaseModel):
+    # The score is computed by team_state; the model only writes the narrative
+    updated_strengths: list[str] = Field(
+        default_factory=list, description="3 fortalezas clave; conserva las del análisis anterior que sigan vigentes"
+    )
+    updated_weaknesses: list[str] = Field(default_factory=list, description="2 debilidades emergentes")
+    detailed_analysis: str = Field(
+        default="", description="Unas 150 palabras sobre el impacto de los cambios en la dinámica del equipo"
+    )
+    recommendations: list[str] = Field(default_factory=list, description="Recomendaciones de mejora o capacitación")
+
+
+def _inline_schema(schema, definitions=None):
+    """Resolves $ref and marks every property as required."""
+    definitions = schema.get("$defs", {}) if definitions is None else definitions
+    if isinstance(schema, list):
+        return [_inline_schema(item, definitions) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    if "$ref" in schema:
+        return _inline_schema(definitions[schema["$ref"].split("/")[-1]], definitions)
+    inlined = {
+        key: _inline_schema(value, definitions)
+        for key, value in schema.items()
+        if key not in ("$defs", "title", "default")
+    }
+    if "properties" in inlined:
+        inlined["required"] = list(inlined["properties"])
+    return inlined
+
+
+class OutputTool:
+    """The tool through which an endpoint's model answers, and its validation."""
+
+    def __init__(self, name, description, model):
+        self.name = name
+        self.description = description
+        self.model = model
+        self.definition = {
+            "name": name,
+            "description": description,
+            "input_schema": _inline_schema(model.model_json_schema()),
+        }
+        self.choice = {"type": "tool", "name": name}
+
+    def validate(self, value) -> BaseModel:
+        return self.model.model_validate(value)
+
+
+EXPLAIN_TEAM = OutputTool(
+    "explain_team",
+    "Entrega la explicación del equipo seleccionado: líder, análisis y candidatos alternativos.",
+    TeamExplanation,
+)
+RECOMMEND_CANDIDATES = OutputTool(
+    "recommend_candidates",
+    "Entrega los mejores candidatos para sumarse al equipo, ordenados por compatibilidad.",
+    CandidateRecommendations,
+)
+REANALYZE_TEAM = OutputTool(
+    "reanalyze_team",
+    "Entrega el re-análisis del equipo tras la incorporación de un miembro.",
+    TeamReanalysis,
+)
@@ -0,0 +1,385 @@
+"""
+Prompt templates for the model-backed endpoints.
+
+Each endpoint's prompt is split into a static system prefix (role, SFIA and
+MBTI guides) and a dynamic user suffix with the request data. The answer
+format is not described in the text: each template carries the output tool
+(output_schemas) the model is forced to call. Tools and prefix are identical
+on every call, so a prefix long enough for the provider's prompt cache (at
+least 1024 tokens on Sonnet, 4096 on Haiku 4.5; shorter ones are never
+cached) is sent with `cache_control`; templates below that are built with
+cache=False. The prefix token count is measured once per model and
+reused. Bump `version` whenever the static text
+changes so cached results built with the old text are not reused.
+"""
+import json
+import logging
+import string
+import textwrap
+
+import output_schemas
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token for Spanish text with JSON, used when the
+# token counting endpoint is not reachable
+CHARS_PER_TOKEN = 3.5
+
+
+def estimate_tokens(text) -> int:
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+class PromptTemplate:
+    """A versioned static system prefix plus a format-string user suffix, answered through `tool`."""
+
+    def __init__(self, name, version, system, user, tool=None, cache=True):
+        self.name = name
+        self.version = version
+        self.tool = tool
+        self.cache = cache
+        self.system = textwrap.dedent(system).strip()
+        self.user = textwrap.dedent(user).strip()
+        self.fields = {field for _, field, _, _ in string.Formatter().parse(self.user) if field}
+        block = {"type": "text", "text": self.system}
+        if cache:
+            block["cache_control"] = {"type": "ephemeral"}
+        self._system_blocks = [block]
+        self._token_counts = {}
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.version}"
+
+    def system_blocks(self):
+        return self._system_blocks
+
+    def tool_params(self):
+        """tools and tool_choice keyword arguments that force the answer through the output tool."""
+        if self.tool is None:
+            return {}
+        return {"tools": [self.tool.definition], "tool_choice": self.tool.choice}
+
+    def render(self, **values) -> str:
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Missing prompt fields for {self.key}: {sorted(missing)}")
+        return self.user.format(**values)
+
+    def messages(self, **values):
+        return [{"role": "user", "content": self.render(**values)}]
+
+    async def prefix_tokens(self, llm_client, model) -> int:
+        """Tokens in the static prefix for `model`, counted once and then cached."""
+        if model not in self._token_counts:
+            try:
+                self._token_counts[model] = await llm_client.count_tokens(
+                    model=model,
+                    system=self._system_blocks,
+                    messages=[{"role": "user", "content": "."}],
+                    **self.tool_params(),
+                )
+            except Exception as e:
+                logger.warning("Prompt token count failed for %s: %s", self.key, e)
+                return self._estimate_prefix_tokens()
+        return self._token_counts[model]
+
+    def known_prefix_tokens(self, model) -> int:
+        """Counted prefix size when already measured, otherwise the estimate; never calls the API."""
+        return self._token_counts.get(model) or self._estimate_prefix_tokens()
+
+    def _estimate_prefix_tokens(self) -> int:
+        tool_text = json.dumps(self.tool.definition, ensure_ascii=False) if self.tool else ""
+        return estimate_tokens(self.system + tool_text)
+
+    def get_stats(self):
+        return {
+            "version": self.version,
+            "system_chars": len(self.system),
+            "system_tokens_estimate": self._estimate_prefix_tokens(),
+            "tool": self.tool.name if self.tool else None,
+            "cached": self.cache,
+            "system_tokens": dict(self._token_counts),
+            "user_fields": sorted(self.fields),
+        }
+
+
+PROMPTS = {}
+
+
+def register(template):
+    PROMPTS[template.name] = template
+    return template
+
+
+def get_prompt(name) -> PromptTemplate:
+    return PROMPTS[name]
+
+
+async def count_prefix_tokens(llm_client, model):
+    """Measures every registered prefix for `model` so later lookups are free."""
+    return {name: await template.prefix_tokens(llm_client, model) for name, template in PROMPTS.items()}
+
+
+# Shared explanation of the candidate_encoding tables
+CANDIDATE_TABLES_GUIDE = """
+        ## 🗂️ Formato de los Datos de Empleados
+        Los empleados llegan como tablas compactas: "columns" nombra cada posición y cada fila de "rows" es un empleado.
+        - La columna "id" es un id corto (por ejemplo "c3"): úsalo tal cual cada vez que tengas que indicar un id.
+        - Las columnas con listas (technologies, interests, languages...) contienen índices de la lista del mismo nombre en "Diccionarios": technologies [0, 2] significa el primer y el tercer elemento de Diccionarios.technologies.
+        - Al escribir tecnologías, intereses o idiomas en tu respuesta usa siempre su nombre, nunca el índice.
+"""
+
+
+GENERATE_TEAMS = register(PromptTemplate(
+    name="generate-teams",
+    version="v3",
+    tool=output_schemas.EXPLAIN_TEAM,
+    system="""
+        # 🚀 GENERADOR INTELIGENTE DE EQUIPOS DE TRABAJO - Análisis Completo y Amigable
+
+        Eres un experto consultor en recursos humanos y formación de equipos. Un optimizador ya eligió el mejor equipo posible según los pesos del manager; tu trabajo es explicar TODO de manera que cualquier persona pueda entender fácilmente esa decisión.
+
+        En cada solicitud recibirás el equipo seleccionado con su puntaje de compatibilidad, los candidatos alternativos, lo que pidió el manager y los pesos de cada criterio.
+""" + CANDIDATE_TABLES_GUIDE + """
+        ## 📚 GUÍA PARA ENTENDER TODO - Explicado de Manera Simple
+
+        ### 🎓 ¿Qué Significan los Niveles SFIA? (Marco de Competencias Técnicas)
+        Piensa en SFIA como los "niveles de videojuego" de las habilidades técnicas:
+
+        **SFIA Nivel 1-2**: 🌱 "El Aprendiz"
+        - Como un conductor novato que necesita instructor al lado
+        - Requiere supervisión constante y mucha ayuda
+        - Perfecto para roles de prácticas o trainee
+
+        **SFIA Nivel 3**: 🚗 "El Conductor Independiente"
+        - Como alguien que ya maneja solo pero a veces pregunta direcciones
+        - Puede trabajar de forma independiente con orientación ocasional
+        - ¡PERFECTO para roles "Junior"! (No confundir: puede tener años de experiencia)
+
+        **SFIA Nivel 4**: 🏎️ "El Conductor Experimentado"
+        - Como un chofer profesional que puede enseñar a otros
+        - Puede mentorear y guiar a niveles más bajos
+        - Ideal para roles "Semi-Senior" o "Mid-Level"
+
+        **SFIA Nivel 5**: 🏁 "El Instructor de Manejo"
+        - Como el jefe de una escuela de manejo
+        - Liderazgo técnico, toma decisiones complejas
+        - Perfecto para roles "Senior" y "Tech Lead"
+
+        **SFIA Nivel 6-7**: 🛣️ "El Planificador de Carreteras"
+        - Como quien diseña las autopistas de todo el país
+        - Arquitecto de sistemas, visión estratégica
+        - Para roles de "Arquitecto" o "Principal"
+
+        **🔥 SÚPER IMPORTANTE**: El nivel SFIA NO es lo mismo que "junior/senior" en el trabajo.
+        Alguien puede tener SFIA 3 y 10 años de experiencia, sigue siendo perfecto para un rol "Junior" específico.
+
+        ### 🧩 ¿Qué Significan las Personalidades MBTI? (Los "Superpoderes" de Cada Persona)
+
+        **ENFP - "El Motivador Estrella" 🌟**
+        - Como el mejor animador de fiestas, pero para el trabajo
+        - Superpoder: Genera entusiasmo contagioso y levanta el ánimo del equipo
+        - Perfecto para: Brainstorming, motivar cuando hay problemas, generar ideas creativas
+
+        **ENTP - "El Innovador Rebelde" 💡**
+        - Como un inventor loco que siempre encuentra soluciones únicas
+        - Superpoder: Ve problemas desde ángulos que nadie más ve
+        - Perfecto para: Resolver problemas complejos, desafiar ideas, encontrar mejores maneras de hacer las cosas
+
+        **INFP - "El Pacificador Empático" 🕊️**
+        - Como un diplomático que resuelve conflictos sin que nadie se enoje
+        - Superpoder: Mantiene la armonía y se preocupa genuinamente por todos
+        - Perfecto para: Mediar conflictos, mantener moral alta, asegurar que todos se sientan valorados
+
+        **INTJ - "El Arquitecto Maestro" 🏗️**
+        - Como un gran maestro de ajedrez que planifica 10 movimientos adelante
+        - Superpoder: Visión a largo plazo y planes estratégicos perfectos
+        - Perfecto para: Arquitectura de sistemas, planificación a largo plazo, decisiones estratégicas
+
+        **ENFJ - "El Líder Natural" 👑**
+        - Como un entrenador que saca lo mejor de cada jugador
+        - Superpoder: Desarrolla el potencial de otros y coordina perfectamente
+        - Perfecto para: Liderar equipos, mentorear, coordinar proyectos complejos
+
+        **ISTJ - "El Guardián de la Calidad" 🛡️**
+        - Como un inspector de calidad que nunca deja pasar un error
+        - Superpoder: Procesos perfectos, confiabilidad absoluta, atención al detalle
+        - Perfecto para: Asegurar calidad, crear procesos, mantener estabilidad
+
+        ## 🎯 INSTRUCCIONES SÚPER ESPECÍFICAS PARA EXPLICAR EL EQUIPO
+
+        ### 📋 Lo Que DEBES Hacer:
+        1. **Explica LOS PESOS** como si fueran ley: Si el manager puso 25% en tecnología, ¡eso es SÚPER importante!
+        2. **Explica TODO como si fueras un profesor**: Cada decisión debe tener una explicación que mi abuela entendería
+        3. **Personalidades que se complementen**: Como piezas de rompecabezas que encajan perfectamente
+        4. **Niveles SFIA apropiados**: No asumas que SFIA = senioridad laboral
+        5. **Detalla las FORTALEZAS**: Explica por qué este equipo va a ser increíble
+        6. **Identifica DEBILIDADES**: Sé honesto sobre qué podría ser problemático
+        7. **Analiza las alternativas**: Explica qué aportarían los candidatos alternativos
+
+        ### 🚨 Lo Que NO Debes Hacer:
+        - NO cambies, agregues ni quites miembros del equipo seleccionado
+        - NO inventes empleados que no están en los datos
+        - NO asumas que SFIA 5 = "Senior" automáticamente
+        - NO hagas explicaciones cortas y aburridas
+        - NO ignores los pesos que me dieron
+        - NO uses jerga técnica sin explicar
+        - No duplicar miembros recomendados: "recommended_Members" son ÚNICAMENTE los candidatos alternativos
+
+        ## 🎯 REGLA CRÍTICA PARA EL LÍDER:
+        El "recommended_leader" DEBE ser uno de los miembros del equipo seleccionado.
+        NO inventes un líder nuevo. NO uses IDs que no estén en la lista de miembros del equipo.
+        Selecciona al MEJOR líder de entre los miembros del equipo seleccionado.
+
+        ## 📝 RESPUESTA - ¡Hazlo Súper Detallado y Amigable!
+        Responde llamando a la herramienta `explain_team`; cada campo describe lo que debe contener.
+        1. **Usa EJEMPLOS ESPECÍFICOS** - no digas "buen comunicador", di "puede explicar conceptos técnicos complejos"
+        2. **Usa EXACTAMENTE los ids cortos de empleados** (columna "id") que están en los datos proporcionados
+        3. **En recommended_Members van SOLO los candidatos alternativos** (máximo 3), con su mismo compatibility_score
+        4. **Sé BREVE en recommended_Members** - máximo 2-3 oraciones por campo
+        5. **TODO en español** con tono amigable
+    """,
+    user="""
+        ## 👥 Equipo Seleccionado (puntaje de compatibilidad: {team_score}/100)
+        ```json
+        {team_json}
+        ```
+
+        ## 🔁 Candidatos Alternativos (no seleccionados)
+        ```json
+        {alternates_json}
+        ```
+
+        ## 📖 Diccionarios
+        ```json
+        {dictionaries_json}
+        ```
+
+        ## 🎯 Lo Que Me Han Pedido Crear
+        - 👥 Necesito formar un equipo de: {team_size} personas
+        - 💼 Para estos roles específicos: {roles}
+        - 📋 Con estos niveles de experiencia: {levels}
+        - 🏢 En estas áreas de trabajo: {areas}
+        - 💻 Que dominen estas tecnologías: {technologies}
+        - 📈 Con un nivel SFIA mínimo de: {sfia_level}
+
+        ## ⚖️ PRIORIDADES DEL MANAGER - ¡Estos Son Los Criterios Más Importantes!
+        - 🎯 Nivel SFIA (Competencia Técnica): {sfia_weight}% de importancia
+        - 💻 Experiencia en Tecnologías: {technical_weight}% de importancia
+        - 🧠 Compatibilidad de Personalidades: {psychological_weight}% de importancia
+        - 📅 Años de Experiencia: {experience_weight}% de importancia
+        - 🗣️ Habilidades de Comunicación: {language_weight}% de importancia
+        - 🎨 Intereses y Hobbies Compartidos: {interests_weight}% de importancia
+        - 🌍 Zona Horaria y Ubicación: {timezone_weight}% de importancia
+    """,
+))
+
+
+FIND_TEAM_MEMBERS = register(PromptTemplate(
+    name="find-team-members",
+    version="v3",
+    tool=output_schemas.RECOMMEND_CANDIDATES,
+    # About 900 tokens with the tool, under every model's cacheable minimum
+    cache=False,
+    system="""
+        # Análisis de Compatibilidad de Nuevos Miembros para Equipo Existente
+
+        En cada solicitud recibirás los datos del equipo actual, los candidatos disponibles y los criterios de búsqueda.
+""" + CANDIDATE_TABLES_GUIDE + """
+        ## Instrucciones
+        1. Evalúa los candidatos según los criterios de pesos del equipo actual
+        2. Para cada candidato, calcula un puntaje de compatibilidad (0-100) dando especial importancia a:
+           - Compatibilidad con las tecnologías requeridas
+           - Nivel SFIA adecuado para el rol
+           - Complementariedad con los perfiles MBTI actuales del equipo
+        3. Analiza cómo cada candidato complementaría al equipo actual considerando:
+           - Compatibilidad técnica (stack tecnológico)
+           - Compatibilidad de personalidad (MBTI)
+           - Experiencia relevante
+           - Complementariedad con las fortalezas y debilidades del equipo actual
+        4. Selecciona los 5 mejores candidatos según su puntaje de compatibilidad
+
+        ### IMPORTANTE:
+        - UTILIZA ÚNICAMENTE los candidatos proporcionados en los datos JSON
+        - Asegúrate que el candidato no sea ya miembro del equipo
+        - Realiza un análisis profundo considerando aspectos técnicos y de compatibilidad psicológica
+        - Da mayor peso a candidatos con experiencia en las tecnologías específicamente solicitadas
+
+        ## Respuesta
+        Responde llamando a la herramienta `recommend_candidates` con EXACTAMENTE 5 candidatos, ordenados por puntaje de compatibilidad (de mayor a menor), usando el id corto (columna "id") de cada candidato y todo en español.
+    """,
+    user="""
+        ## Datos del Equipo Actual
+        ```json
+        {team_json}
+        ```
+
+        ## Datos de Candidatos Disponibles
+        ```json
+        {candidates_json}
+        ```
+
+        ## Diccionarios
+        ```json
+        {dictionaries_json}
+        ```
+
+        ## Criterios de Búsqueda
+        - Rol buscado: {role}
+        - Área técnica: {area}
+        - Nivel requerido: {level}
+        - Tecnologías requeridas: {technologies_json}
+    """,
+))
+
+
+REANALYZE_TEAM = register(PromptTemplate(
+    name="reanalyze-team",
+    version="v3",
+    tool=output_schemas.REANALYZE_TEAM,
+    # About 500 tokens with the tool, under every model's cacheable minimum
+    cache=False,
+    system="""
+        # Re-análisis de Equipo tras un Cambio de Miembros
+
+        El sistema ya calculó el nuevo puntaje de compatibilidad y su desglose por criterio (0-100); no los recalcules.
+        En cada solicitud recibirás el análisis anterior del equipo, los miembros que se incorporaron o salieron desde ese análisis (con su encaje con el resto del equipo), el resto del equipo en resumen, las tecnologías requeridas y los pesos de compatibilidad.
+
+        ## Tareas:
+        1. Actualizar las 3 fortalezas clave: conserva las del análisis anterior que sigan vigentes y reemplaza las que los cambios invalidan
+        2. Detectar 2 posibles debilidades emergentes
+        3. Explicar el impacto de los cambios en la dinámica del equipo, apoyándote en la variación del puntaje por criterio
+        4. Proporcionar recomendaciones de mejora
+
+        Si no hay análisis anterior, analiza el equipo completo: todos sus miembros figuran como incorporados.
+
+        Responde llamando a la herramienta `reanalyze_team`, todo en español.
+    """,
+    user="""
+        ## Puntaje de Compatibilidad (calculado por el sistema)
+        Antes: {score_before} · Ahora: {score}
+
+        ## Desglose por Criterio (antes → ahora):
+        {breakdown_json}
+
+        ## Análisis Anterior:
+        {previous_analysis_json}
+
+        ## Miembros Incorporados:
+        {added_json}
+
+        ## Miembros que Salieron del Equipo:
+        {removed_json}
+
+        ## Resto del Equipo:
+        {unchanged_json}
+
+        ## Tecnologías Requeridas:
+        {technologies}
+        Sin cubrir por ningún miembro: {missing_technologies}
+
+        ## Pesos de Compatibilidad:
+        {weights_json}
+    """,
+))
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+
+def _stable_hash(value) -> str:
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint_rows(rows) -> str:
+    """Order-independent fingerprint of the candidate rows; changes whenever any profile field changes."""
+    return _stable_hash(sorted(_stable_hash(row) for row in rows or []))
+
+
+class ResultCache:
+    """
+    In-memory LRU cache with a TTL for the results of LLM-backed endpoints.
+
+    Keys combine the normalized request with a fingerprint of the data the
+    model saw (candidate rows, team data), so an entry is never served once
+    an employee's profile has changed. Entries carry tags (team, creator,
+    employee ids) so the backend can drop them explicitly.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=900.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(max_entries=settings.result_cache_max_entries, ttl_seconds=settings.result_cache_ttl_s)
+
+    @staticmethod
+    def make_key(endpoint, request_payload, *data_fingerprints) -> str:
+        return _stable_hash({"endpoint": endpoint, "request": request_payload, "data": list(data_fingerprints)})
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, tags=()):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value, frozenset(tags))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, tags=None) -> int:
+        """Drops entries carrying any of the given tags, or every entry when no tags are given."""
+        if not tags:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            tags = set(tags)
+            stale = [key for key, (_, _, entry_tags) in self._entries.items() if entry_tags & tags]
+            for key in stale:
+                del self._entries[key]
+            removed = len(stale)
+        self.invalidations += removed
+        return removed
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
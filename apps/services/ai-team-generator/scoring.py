@@ -0,0 +1,188 @@
+"""
+Deterministic scoring of candidates against the seven WeightsModel criteria.
+
+Every criterion is computed for the whole candidate batch at once and
+normalized to [0, 1]; the final score is the weighted sum scaled to 0-100.
+Criteria that compare people (personality, language, interests, timezone)
+are measured against a reference group: the current team members when
+looking for a new member, or the rest of the candidate pool when a team is
+being generated from scratch.
+"""
+import numpy as np
+
+from compatibility import PAIRWISE_CRITERIA, compatibility_matrix, encode_people, mean_compatibility
+
+CRITERIA = ("sfia", "technical", "psychological", "experience", "language", "interests", "timezone")
+
+WEIGHT_KEYS = {
+    "sfia": "sfia_weight",
+    "technical": "technical_weight",
+    "psychological": "psychological_weight",
+    "experience": "experience_weight",
+    "language": "language_weight",
+    "interests": "interests_weight",
+    "timezone": "timezone_weight",
+}
+
+LEVEL_RANK = {"Junior": 0, "Staff": 1, "Senior": 2, "Architect": 3}
+
+
+class ScoreMatrix:
+    """Per-candidate, per-criterion scores plus the weighted total for each candidate."""
+
+    def __init__(self, rows, matrix, weights, people=None):
+        self.rows = rows
+        # The rows' compatibility lookup codes, reused for pairwise scoring
+        self.people = people
+        self.matrix = matrix
+        self.weights = weights
+        self.totals = matrix @ weights * 100.0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def ranked_indices(self):
+        # Stable sort keeps the database ordering as tie-breaker
+        return np.argsort(-self.totals, kind="stable")
+
+    def breakdown(self, index):
+        return {criterion: round(float(self.matrix[index, i]) * 100, 1) for i, criterion in enumerate(CRITERIA)}
+
+    def score(self, index):
+        return int(round(float(self.totals[index])))
+
+    def ranked_rows(self, limit=None):
+        """Returns the candidate rows best-first, each with its score and criterion breakdown."""
+        indices = self.ranked_indices()
+        if limit is not None:
+            indices = indices[:limit]
+        return [
+            {**self.rows[i], "local_score": self.score(i), "score_breakdown": self.breakdown(i)}
+            for i in indices
+        ]
+
+
+def weights_vector(weights):
+    """Normalizes a {"sfia_weight": 20, ...} mapping into a vector summing to 1."""
+    values = np.array([float((weights or {}).get(WEIGHT_KEYS[c]) or 0) for c in CRITERIA])
+    total = values.sum()
+    if total <= 0:
+        return np.full(len(CRITERIA), 1.0 / len(CRITERIA))
+    return values / total
+
+
+def _as_set(values):
+    return {str(v).strip().lower() for v in (values or []) if v}
+
+
+def _incidence(sets, vocabulary):
+    matrix = np.zeros((len(sets), len(vocabulary)), dtype=np.float32)
+    for i, values in enumerate(sets):
+        for value in values:
+            matrix[i, vocabulary[value]] = 1.0
+    return matrix
+
+
+def _vocabulary(*groups):
+    vocabulary = {}
+    for sets in groups:
+        for values in sets:
+            for value in values:
+                vocabulary.setdefault(value, len(vocabulary))
+    return vocabulary
+
+
+def pair_scores(person, others):
+    """
+    Scores of `person` paired with each of `others` on PAIRWISE_CRITERIA;
+    a (len(others), 4) array. Costs O(len(others)).
+    """
+    return compatibility_matrix([person], others)[0]
+
+
+def individual_scores(person):
+    """SFIA and experience of one person, scored as score_candidates does without a minimum level."""
+    sfia = float(person.get("sfia_level") or 0)
+    years = float(person.get("years_experience") or 0)
+    level = LEVEL_RANK.get(person.get("role_level"), 0)
+    return {
+        "sfia": min(max(sfia / 7.0, 0.0), 1.0),
+        "experience": 0.5 * min(max(years / 10.0, 0.0), 1.0) + 0.5 * level / 3.0,
+    }
+
+
+def score_candidates(rows, weights, technologies=None, min_sfia_level=None, reference=None):
+    """
+    Scores candidate rows (as returned by TeamDatabaseService) on every criterion.
+
+    `reference` are the people candidates will work with (team member dicts);
+    when omitted the candidates are compared against each other.
+    """
+    n = len(rows)
+    self_reference = reference is None
+
+    matrix = np.zeros((n, len(CRITERIA)))
+    if n == 0:
+        return ScoreMatrix(rows, matrix, weights_vector(weights))
+
+    # SFIA: meeting the requested level scores 0.6, each level above adds 0.2
+    sfia = np.array([float(r.get("sfia_level") or 0) for r in rows])
+    if min_sfia_level is not None:
+        matrix[:, 0] = np.clip(0.6 + 0.2 * (sfia - float(min_sfia_level)), 0.0, 1.0)
+    else:
+        matrix[:, 0] = np.clip(sfia / 7.0, 0.0, 1.0)
+
+    # Technical: coverage of the requested stack, or breadth when none was requested
+    candidate_techs = [_as_set(r.get("technologies")) for r in rows]
+    requested = _as_set(technologies)
+    if requested:
+        vocabulary = _vocabulary([requested])
+        coverage = _incidence([techs & requested for techs in candidate_techs], vocabulary)
+        matrix[:, 1] = coverage.sum(axis=1) / len(requested)
+    else:
+        matrix[:, 1] = np.clip(np.array([len(t) for t in candidate_techs]) / 5.0, 0.0, 1.0)
+
+    # Experience: years in the specialized role blended with the role level
+    years = np.array([float(r.get("years_experience") or 0) for r in rows])
+    level = np.array([LEVEL_RANK.get(r.get("role_level"), 0) for r in rows], dtype=float)
+    matrix[:, 3] = 0.5 * np.clip(years / 10.0, 0.0, 1.0) + 0.5 * level / 3.0
+
+    # Personality (MBTI complementarity), language (share of the group the
+    # candidate has a common language with), interests (mean Jaccard
+    # similarity) and timezone (working-hours overlap) against the reference group
+    codes = encode_people(rows)
+    interpersonal = mean_compatibility(codes, None if self_reference else reference, exclude_self=self_reference)
+    if interpersonal is None:
+        matrix[:, [2, 5, 6]] = 0.5
+        matrix[:, 4] = np.clip(codes.language_counts / 2.0, 0.0, 1.0)
+    else:
+        for c, criterion in enumerate(PAIRWISE_CRITERIA):
+            matrix[:, CRITERIA.index(criterion)] = interpersonal[:, c]
+
+    return ScoreMatrix(rows, matrix, weights_vector(weights), people=codes)
+
+
+def pairwise_compatibility(rows, weights):
+    """
+    Candidate x candidate compatibility from the interpersonal criteria;
+    `rows` may also be their PeopleCodes.
+
+    MBTI complementarity, shared interests and timezone overlap are blended
+    with their relative request weights. Returns the (n, n) matrix, with a
+    zero diagonal, and the share of the total weight those criteria hold.
+    """
+    n = len(rows)
+    vector = weights_vector(weights)
+    parts = {
+        "psychological": vector[CRITERIA.index("psychological")],
+        "interests": vector[CRITERIA.index("interests")],
+        "timezone": vector[CRITERIA.index("timezone")],
+    }
+    share = float(sum(parts.values()))
+    if n == 0 or share <= 0:
+        return np.zeros((n, n)), 0.0
+
+    pair_weights = [parts.get(criterion, 0.0) / share for criterion in PAIRWISE_CRITERIA]
+    matrix = compatibility_matrix(rows, rows, weights=pair_weights)
+    np.fill_diagonal(matrix, 0.0)
+    return matrix, share
@@ -0,0 +1,255 @@
+"""
+Similarity ranking of the candidate index rows for /find-team-members.
+
+Every row of the CandidateIndex snapshot is a sparse binary vector over a
+vocabulary of its technologies, technical area and interests, stored as
+CSR arrays (row offsets and feature columns). A search builds a weighted
+query vector and scores every row in one pass: the query weights are
+gathered at each row's columns and summed per row with `np.add.reduceat`,
+so a query costs O(non-zeros) numpy work however many employees there are.
+
+The query weighs:
+
+- each requested technology, doubled when no current member has it (the
+  team's gap);
+- technologies that appear with a requested one well above chance in the
+  snapshot (lift), weighted by how often they do, so related stacks are
+  not missed;
+- the requested areas and the interests the team shares.
+
+`rank_rows` applies the same ranking to a pool of rows read from SQL when
+the candidate index is off.
+
+Rows are appended as the index receives changes and the rows they replace
+are marked dead; the arrays are extended lazily before the next search.
+Feature counts only cover live rows, and cached co-occurrences are dropped
+whenever rows are added or removed.
+"""
+import time
+
+import numpy as np
+
+REQUESTED_TECHNOLOGY_WEIGHT = 1.0
+GAP_TECHNOLOGY_WEIGHT = 2.0
+# Per requested technology, its most frequent companions among those seen
+# with it at least MIN_RELATED_LIFT times as often as with anyone
+RELATED_TECHNOLOGIES = 3
+MIN_RELATED_LIFT = 1.5
+# Scaled by the share of the requested technology's holders who have it
+RELATED_TECHNOLOGY_WEIGHT = 0.5
+AREA_WEIGHT = 0.5
+# Scaled by the share of members holding the interest
+INTEREST_WEIGHT = 0.25
+
+
+def _normalized(value) -> str:
+    return str(value).strip().lower()
+
+
+def normalized_technologies(technologies) -> set:
+    """Technologies as the ranking compares them: trimmed and case-insensitive."""
+    return {_normalized(t) for t in technologies or [] if t}
+
+
+def _features(row):
+    yield "technology", row.get("technologies") or []
+    yield "area", [row["technical_area"]] if row.get("technical_area") else []
+    yield "interest", row.get("interests") or []
+
+
+def bits_to_mask(bits, size) -> np.ndarray:
+    """A Python int bitset of row positions as a boolean array of `size` rows."""
+    data = np.frombuffer(bits.to_bytes((size + 7) // 8 or 1, "little"), dtype=np.uint8)
+    return np.unpackbits(data, bitorder="little", count=size).astype(bool)
+
+
+class SkillIndex:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.features = {}
+        self._technology_columns = []
+        self._pending_columns = []
+        self._pending_lengths = []
+        self._pending_sfia = []
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._row_of = np.zeros(0, dtype=np.int32)
+        self._counts = np.zeros(0)
+        self._sfia = np.zeros(0)
+        self._live = np.zeros(0, dtype=bool)
+        self._changed = False
+        self._related = {}
+        self.searches = 0
+        self.last_search_ms = None
+
+    def __len__(self):
+        return len(self._indptr) - 1 + len(self._pending_lengths)
+
+    def _column(self, kind, value):
+        key = (kind, _normalized(value))
+        column = self.features.get(key)
+        if column is None:
+            column = self.features[key] = len(self.features)
+            if kind == "technology":
+                self._technology_columns.append(column)
+        return column
+
+    def add(self, row):
+        """Appends a row; its position must be the CandidateIndex row position."""
+        columns = sorted({
+            self._column(kind, value) for kind, values in _features(row) for value in values if value
+        })
+        self._pending_columns.extend(columns)
+        self._pending_lengths.append(len(columns))
+        self._pending_sfia.append(row.get("sfia_level") if row.get("sfia_level") is not None else -1)
+        self._changed = True
+
+    def remove(self, positions):
+        """Marks rows dead; they keep their position but stop counting towards co-occurrences."""
+        if not len(positions):
+            return
+        if self._pending_lengths:
+            self._append_pending()
+        self._live[np.asarray(positions, dtype=np.intp)] = False
+        self._changed = True
+
+    def _compile(self):
+        if self._pending_lengths:
+            self._append_pending()
+        if self._changed:
+            self._counts = np.bincount(
+                self._indices[self._live[self._row_of]], minlength=len(self.features)
+            ).astype(float)
+            self._related = {}
+            self._changed = False
+
+    def _append_pending(self):
+        start = len(self._indptr) - 1
+        lengths = np.array(self._pending_lengths, dtype=np.int64)
+        self._indices = np.concatenate([self._indices, np.array(self._pending_columns, dtype=np.int32)])
+        self._indptr = np.concatenate([self._indptr, self._indptr[-1] + np.cumsum(lengths)])
+        self._row_of = np.concatenate([
+            self._row_of, np.repeat(np.arange(start, start + len(lengths), dtype=np.int32), lengths)
+        ])
+        self._sfia = np.concatenate([self._sfia, np.array(self._pending_sfia, dtype=float)])
+        self._live = np.concatenate([self._live, np.ones(len(lengths), dtype=bool)])
+        self._pending_columns = []
+        self._pending_lengths = []
+        self._pending_sfia = []
+
+    def related_technologies(self, column):
+        """(column, share of `column`'s holders who have it) of the technologies related to `column`."""
+        self._compile()
+        if column not in self._related:
+            holders = np.zeros(len(self), dtype=bool)
+            holders[self._row_of[self._indices == column]] = True
+            holders &= self._live
+            together = np.bincount(self._indices[holders[self._row_of]], minlength=len(self.features))
+            technologies = np.array(self._technology_columns, dtype=np.intp)
+            confidence = together[technologies] / max(self._counts[column], 1.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                lift = np.nan_to_num(confidence * self._live.sum() / self._counts[technologies])
+            confidence[(technologies == column) | (lift < MIN_RELATED_LIFT)] = 0.0
+            best = np.argsort(-confidence, kind="stable")[:RELATED_TECHNOLOGIES]
+            self._related[column] = [(int(technologies[i]), float(confidence[i])) for i in best if confidence[i] > 0]
+        return self._related[column]
+
+    def query(self, technologies, areas, members):
+        """The query vector for the requested technologies and areas and the current team."""
+        self._compile()
+        query = np.zeros(len(self.features))
+        team_technologies = {_normalized(t) for member in members for t in member.get("technologies") or []}
+        requested = []
+        for technology in technologies or []:
+            column = self.features.get(("technology", _normalized(technology)))
+            if column is None:
+                continue
+            requested.append(column)
+            gap = _normalized(technology) not in team_technologies
+            query[column] = GAP_TECHNOLOGY_WEIGHT if gap else REQUESTED_TECHNOLOGY_WEIGHT
+        for column in requested:
+            for related, share in self.related_technologies(column):
+                if related not in requested:
+                    query[related] = max(query[related], RELATED_TECHNOLOGY_WEIGHT * share)
+        for area in areas:
+            column = self.features.get(("area", _normalized(area)))
+            if column is not None:
+                query[column] = AREA_WEIGHT
+        if members:
+            interests = {}
+            for member in members:
+                for interest in {_normalized(i) for i in member.get("interests") or []}:
+                    interests[interest] = interests.get(interest, 0) + 1
+            for interest, holders in interests.items():
+                column = self.features.get(("interest", interest))
+                if column is not None:
+                    query[column] = INTEREST_WEIGHT * holders / len(members)
+        return query
+
+    def scores(self, query, positions) -> np.ndarray:
+        """Dot product of the rows at `positions` (sorted, distinct) with the query."""
+        self._compile()
+        everyone = len(positions) > len(self) // 2
+        if everyone:
+            # Scoring every row is cheaper than gathering most of them
+            columns, starts = self._indices, self._indptr[:-1]
+            lengths = np.diff(self._indptr)
+        else:
+            starts = self._indptr[positions]
+            lengths = self._indptr[positions + 1] - starts
+            offsets = np.cumsum(lengths) - lengths
+            columns = self._indices[np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())]
+            starts = offsets
+        if not len(starts):
+            return np.zeros(0)
+        # The trailing 0 keeps every start in range; reduceat returns the
+        # value at the start of an empty row, so those are zeroed
+        scores = np.add.reduceat(np.append(query.take(columns), 0.0), starts)
+        scores[lengths == 0] = 0.0
+        return scores[positions] if everyone else scores
+
+    def top_k(self, eligible, query, limit):
+        """
+        Positions of the `limit` eligible rows (a boolean array) most similar
+        to `query`, best first; ties go to the higher SFIA level, then to the
+        earlier row.
+        """
+        started = time.perf_counter()
+        self._compile()
+        positions = np.flatnonzero(eligible[:len(self)])
+        scores = self.scores(query, positions)
+        if len(positions) > limit:
+            # Everyone tied with the limit-th score stays in for the tie-break
+            threshold = np.partition(scores, len(positions) - limit)[len(positions) - limit]
+            kept = scores >= threshold
+            positions, scores = positions[kept], scores[kept]
+        order = np.lexsort((positions, -self._sfia[positions], -scores))
+        self.searches += 1
+        self.last_search_ms = (time.perf_counter() - started) * 1000
+        return positions[order[:limit]].tolist()
+
+    def get_stats(self):
+        return {
+            "rows": len(self),
+            "live_rows": int(self._live.sum()) + len(self._pending_lengths),
+            "features": len(self.features),
+            "technologies": len(self._technology_columns),
+            "non_zeros": len(self._indices) + len(self._pending_columns),
+            "searches": self.searches,
+            "last_search_ms": self.last_search_ms,
+        }
+
+
+def rank_rows(rows, technologies, areas, members, limit):
+    """
+    The `limit` rows most similar to the request, best first, for a pool
+    read from SQL rather than the candidate index. Related technologies are
+    then those that co-occur within the pool.
+    """
+    index = SkillIndex()
+    for row in rows:
+        index.add(row)
+    query = index.query(technologies, areas, members)
+    return [rows[position] for position in index.top_k(np.ones(len(rows), dtype=bool), query, limit)]
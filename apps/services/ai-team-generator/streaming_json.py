@@ -0,0 +1,164 @@
+import json
+
+
+class _Frame:
+    __slots__ = ("kind", "key", "expecting_key")
+
+    def __init__(self, kind):
+        self.kind = kind
+        # Arrays track the index of the element being read, objects the last key
+        self.key = 0 if kind == "array" else None
+        self.expecting_key = kind == "object"
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON document that arrives in chunks and reports every value whose
+    path matches one of the watched patterns as soon as that value is complete.
+
+    Patterns are tuples of object keys and "*" wildcards for array indexes,
+    e.g. ("teams", "*", "members", "*"). The empty tuple matches the root.
+    Text before the first "{" or "[" (markdown fences, prose) and anything
+    after the root value is ignored. If the text stops before the root value
+    is closed, `salvage()` returns the document cut after its last complete
+    value.
+    """
+
+    def __init__(self, patterns):
+        self._patterns = [tuple(pattern) for pattern in patterns]
+        self._text = ""
+        self._pos = 0
+        self._stack = []
+        self._captures = []
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._token_start = None
+        self._primitive_start = None
+        self._root_start = None
+        # (end, container kinds) of the last point where the document can be closed
+        self._safe_cut = None
+        self.started = False
+        self.done = False
+
+    @property
+    def text(self):
+        return self._text
+
+    @property
+    def consumed(self):
+        """Characters read so far; once `done`, the length of the text up to the end of the root value."""
+        return self._pos
+
+    @property
+    def depth(self):
+        return len(self._stack)
+
+    def feed(self, chunk):
+        """Consumes a chunk of text and returns the list of (path, value) completed by it."""
+        self._text += chunk
+        events = []
+        text = self._text
+        while self._pos < len(text) and not self.done:
+            self._consume(text[self._pos], self._pos, events)
+            self._pos += 1
+        return events
+
+    def _matches(self, path):
+        for pattern in self._patterns:
+            if len(pattern) != len(path):
+                continue
+            if all(p == "*" and isinstance(k, int) or p == k for p, k in zip(pattern, path)):
+                return True
+        return False
+
+    def _current_path(self):
+        return tuple(frame.key for frame in self._stack)
+
+    def _value_start(self, index):
+        path = self._current_path()
+        if self._matches(path):
+            self._captures.append((len(self._stack), index, path))
+
+    def _mark_safe_cut(self, end):
+        # Inside an unfinished array element the element would be cut; objects may lose their tail
+        if any(frame.kind == "array" for frame in self._stack[:-1]):
+            return
+        self._safe_cut = (end, [frame.kind for frame in self._stack])
+
+    def _value_end(self, end, events):
+        if self._captures and self._captures[-1][0] == len(self._stack):
+            _, start, path = self._captures.pop()
+            events.append((path, json.loads(self._text[start:end])))
+        if not self._stack:
+            self.done = True
+        else:
+            self._mark_safe_cut(end)
+
+    def salvage(self):
+        """
+        The root value with every unfinished array element dropped and the
+        open containers closed, e.g. '[{"a": 1}, {"b": 2' gives [{"a": 1}]
+        and '{"a": 1, "b": [2, 3' gives {"a": 1, "b": [2]}. Returns None when
+        nothing could be kept.
+        """
+        if self._safe_cut is None:
+            return None
+        end, kinds = self._safe_cut
+        closers = "".join("}" if kind == "object" else "]" for kind in reversed(kinds))
+        return json.loads(self._text[self._root_start:end] + closers)
+
+    def _consume(self, char, index, events):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._string_is_key:
+                    frame = self._stack[-1]
+                    frame.key = json.loads(self._text[self._token_start:index + 1])
+                    frame.expecting_key = False
+                else:
+                    self._value_end(index + 1, events)
+            return
+
+        if self._primitive_start is not None:
+            if char not in ",}] \t\r\n":
+                return
+            self._primitive_start = None
+            self._value_end(index, events)
+            if self.done:
+                return
+
+        if not self.started:
+            if char not in "{[":
+                return
+            self.started = True
+            self._root_start = index
+
+        if char in " \t\r\n:":
+            return
+        if char == '"':
+            self._in_string = True
+            self._token_start = index
+            self._string_is_key = bool(self._stack) and self._stack[-1].expecting_key
+            if not self._string_is_key:
+                self._value_start(index)
+        elif char in "{[":
+            self._value_start(index)
+            self._stack.append(_Frame("object" if char == "{" else "array"))
+            self._mark_safe_cut(index + 1)
+        elif char in "}]":
+            self._stack.pop()
+            self._value_end(index + 1, events)
+        elif char == ",":
+            frame = self._stack[-1]
+            if frame.kind == "array":
+                frame.key += 1
+            else:
+                frame.expecting_key = True
+        else:
+            self._value_start(index)
+            self._primitive_start = index
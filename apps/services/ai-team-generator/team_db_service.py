@@ -1,45 +1,149 @@
+import asyncio
+import json
+import logging
+import time
+
 from databases import Database
 from fastapi import HTTPException
 
-class TeamDatabaseService:
-    def __init__(self, connection_string):
-        self.db = Database(connection_string)
-        
-    async def connect(self):
-        await self.db.connect()
-        
-    async def disconnect(self):
-        await self.db.disconnect()
-    
-    def _get_privacy_filter(self):
-        """
-        Returns privacy filter for team matching based on user consent.
-        
-        GDPR Implementation: Only includes employees who have explicitly 
-        consented to 'team_matching_analysis' in their privacy settings.
-        
-        Impact: Employees with team_matching_analysis=false will NOT appear
-        in team suggestions or automatic team generation.
-        """
-        # Only include employees who have consented to team matching analysis
-        return """
+from observability import DB_FETCH_SECONDS, timed
+from skill_index import rank_rows
+
+logger = logging.getLogger(__name__)
+
+# jsonb aggregates come back from asyncpg as raw JSON text
+JSON_COLUMNS = ("technologies", "interests", "languages")
+
+
+def _decode_json(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _row_to_dict(row):
+    data = dict(row)
+    for column in JSON_COLUMNS:
+        if column in data:
+            data[column] = _decode_json(data[column]) or []
+    return data
+
+
+LEVEL_NAMES = ("Junior", "Staff", "Senior", "Architect")
+
+APPROVED_VERIFICATION_STATUS = "2"
+
+# Without the candidate index, /find-team-members ranks this many times the
+# requested number of candidates read from SQL
+SQL_SEARCH_POOL_FACTOR = 5
+
+
+def parse_level(level):
+    """Accepts the level name or its enum index as sent by the backend."""
+    if isinstance(level, int):
+        return LEVEL_NAMES[level] if 0 <= level < len(LEVEL_NAMES) else None
+    return level if level in LEVEL_NAMES else None
+
+
+def split_areas(area):
+    """Requirements may list several areas separated by commas."""
+    return [a.strip() for a in (area or "").split(",") if a.strip()]
+
+
+# Only employees who consented to 'team_matching_analysis' (GDPR). Checked
+# against the live consents table on every query, never the match profile,
+# so a granted or withdrawn consent takes effect immediately.
+PRIVACY_FILTER = """
           AND EXISTS (
             SELECT 1 FROM public.user_privacy_consents upc
             JOIN public.users u ON u.id = upc.user_id
-            WHERE u.id = ep.user_id 
+            WHERE u.id = mp.user_id 
               AND upc.team_matching_analysis = true
           )
-        """
-        
-    async def get_team_data(self, team_id):
-        # Direct SQL query for team data
-        query = """
-        WITH
+"""
+
+MATCH_PROFILE_VIEW = "public.employee_match_profile"
+
+# One row per employee and specialized role with everything matching needs
+# already aggregated; role_key stands in for employees without a role so
+# the unique index (required by REFRESH ... CONCURRENTLY) covers every row.
+# The materialized view is created by the backend migration
+# EmployeeMatchProfile from this same SELECT; keep the two in sync.
+MATCH_PROFILE_SELECT = """
+        SELECT
+            ep.id AS employee_id,
+            coalesce(esr.specialized_role_id, '00000000-0000-0000-0000-000000000000'::uuid) AS role_key,
+            ep.user_id,
+            ep.first_name,
+            ep.last_name,
+            ep.first_name || ' ' || ep.last_name AS name,
+            sr.name AS role,
+            ta.name AS technical_area,
+            esr.level AS role_level,
+            esr.years_experience,
+            ep.sfia_level_general AS sfia_level,
+            ep.mbti,
+            ep.timezone,
+            ep.country,
+            ep.availability,
+            ep.verification_status,
+            coalesce(tech.names, '{}'::text[]) AS technologies,
+            coalesce(interest.names, '{}'::text[]) AS interests,
+            coalesce(lang.names, '{}'::text[]) AS languages
+        FROM public.employee_profiles ep
+        LEFT JOIN public.employee_specialized_roles esr ON esr.employee_profile_id = ep.id
+        LEFT JOIN public.specialized_roles sr ON sr.id = esr.specialized_role_id
+        LEFT JOIN public.technical_areas ta ON ta.id = sr.technical_area_id
+        LEFT JOIN LATERAL (
+            SELECT array_agg(DISTINCT t.name::text) AS names
+            FROM public.employee_technologies et
+            JOIN public.technologies t ON t.id = et.technology_id
+            WHERE et.employee_profile_id = ep.id
+        ) tech ON true
+        LEFT JOIN LATERAL (
+            SELECT array_agg(DISTINCT pi.name::text) AS names
+            FROM public.personal_interests pi
+            WHERE pi.employee_profile_id = ep.id
+        ) interest ON true
+        LEFT JOIN LATERAL (
+            SELECT array_agg(DISTINCT el.language::text) AS names
+            FROM public.employee_languages el
+            WHERE el.employee_profile_id = ep.id
+        ) lang ON true"""
+
+CANDIDATE_COLUMNS = """
+            mp.employee_id,
+            mp.name,
+            mp.role,
+            mp.technical_area,
+            mp.role_level,
+            mp.years_experience,
+            mp.sfia_level,
+            mp.mbti,
+            mp.timezone,
+            mp.country,
+            mp.availability,
+            mp.technologies,
+            mp.interests,
+            mp.languages"""
+
+
+def _profile_queries(source):
+    """
+    Builds the team and candidate queries over a match profile source: the
+    materialized view, or the same SELECT inlined when the view is missing.
+
+    Each query has a fixed text and takes every value as a bound parameter
+    (lists as arrays), so asyncpg prepares it once per pooled connection and
+    Postgres can reuse its plan. Empty arrays and NULLs disable a filter.
+    """
+    # The team row and its members as one jsonb document, with the ids of every
+    # current member (also those missing from the profile source)
+    team_ctes = f"""
         team_data AS (
           SELECT
             t.id,
             t.name,
             t.compatibility_score,
+            t.creator_id,
             t.ai_analysis,
             t.weight_criteria
           FROM public.teams AS t
@@ -49,39 +153,26 @@ class TeamDatabaseService:
           SELECT
             tm.team_id,
             jsonb_build_object(
-              'profile_id', ep.id,
-              'first_name', ep.first_name,
-              'last_name', ep.last_name,
-              'role', sr.name,
-              'sfia_level', ep.sfia_level_general,
-              'mbti', ep.mbti,
-              'timezone', ep.timezone,
-              'country', ep.country,
-              'availability', ep.availability,
-              'technologies', (
-                SELECT jsonb_agg(tech.name)
-                FROM public.employee_technologies AS et
-                JOIN public.technologies AS tech ON tech.id = et.technology_id
-                WHERE et.employee_profile_id = ep.id
-              ),
-              'interests', (
-                SELECT jsonb_agg(pi.name)
-                FROM public.personal_interests AS pi
-                WHERE pi.employee_profile_id = ep.id
-              ),
-              'languages', (
-                SELECT jsonb_agg(el.language)
-                FROM public.employee_languages AS el
-                WHERE el.employee_profile_id = ep.id
-              )
+              'profile_id', mp.employee_id,
+              'first_name', mp.first_name,
+              'last_name', mp.last_name,
+              'role', mp.role,
+              'role_level', mp.role_level,
+              'years_experience', mp.years_experience,
+              'sfia_level', mp.sfia_level,
+              'mbti', mp.mbti,
+              'timezone', mp.timezone,
+              'country', mp.country,
+              'availability', mp.availability,
+              'technologies', to_jsonb(mp.technologies),
+              'interests', to_jsonb(mp.interests),
+              'languages', to_jsonb(mp.languages)
             ) AS member_json
           FROM public.team_members AS tm
-          JOIN public.employee_profiles AS ep ON ep.id = tm.employee_profile_id
-          LEFT JOIN public.employee_specialized_roles AS esr ON esr.employee_profile_id = ep.id
-          LEFT JOIN public.specialized_roles AS sr ON sr.id = esr.specialized_role_id
+          JOIN {source} AS mp ON mp.employee_id = tm.employee_profile_id
           WHERE tm.team_id = :team_id
-        )
-        SELECT jsonb_build_object(
+        )"""
+    team_document = """jsonb_build_object(
             'team', (
                 SELECT row_to_json(td)
                 FROM team_data td
@@ -89,198 +180,359 @@ class TeamDatabaseService:
             'members', (
                 SELECT coalesce(jsonb_agg(md.member_json) FILTER (WHERE md.member_json IS NOT NULL), '[]'::jsonb)
                 FROM member_data md
+            ),
+            'member_ids', (
+                SELECT coalesce(jsonb_agg(tm.employee_profile_id), '[]'::jsonb)
+                FROM public.team_members tm
+                WHERE tm.team_id = :team_id
             )
-        ) AS result
-        """
-        result = await self.db.fetch_one(query, {"team_id": team_id})
-        if not result:
-            return None
-        return result["result"]
-    
-    async def get_team_candidates(self, team_id, role, area, level_name, technologies):
-        mem_rows = await self.db.fetch_all(
-            "SELECT employee_profile_id FROM public.team_members WHERE team_id = :team_id",
-            {"team_id": team_id},
-        )
-        current_ids = [str(r["employee_profile_id"]) for r in mem_rows]
-        exclude_filter = (
-            f" AND ep.id NOT IN ('{"','".join(current_ids)}')" if current_ids else ""
+        )"""
+    # Current members are excluded server-side
+    team_search_filter = f"""NOT EXISTS (
+            SELECT 1 FROM public.team_members tm
+            WHERE tm.team_id = :team_id AND tm.employee_profile_id = mp.employee_id
+          )
+          AND (CAST(:role AS text) IS NULL OR mp.role = CAST(:role AS text))
+          AND (cardinality(CAST(:areas AS text[])) = 0 OR mp.technical_area = ANY(CAST(:areas AS text[])))
+          AND (CAST(:level AS text) IS NULL OR mp.role_level = CAST(:level AS text))
+          {PRIVACY_FILTER}"""
+    # Trimmed and case-insensitive, like the skill similarity ranking
+    holds_requested_tech = """EXISTS (
+              SELECT 1 FROM unnest(mp.technologies) AS tech(name)
+              WHERE lower(trim(tech.name)) IN (SELECT lower(trim(t)) FROM unnest(CAST(:techs AS text[])) AS t)
+            )"""
+    return {
+        "team_data": f"""
+        WITH{team_ctes}
+        SELECT {team_document} AS result
+        """,
+        # The team document and a pool of candidates in one round trip: one row
+        # per candidate, the team document on the first one, and a single row
+        # with NULL candidate columns when nobody matches. Technologies only
+        # order the pool (holders first); get_team_search_data ranks it by
+        # skill similarity
+        "team_search": f"""
+        WITH{team_ctes},
+        candidates AS (
+          SELECT{CANDIDATE_COLUMNS},
+            {holds_requested_tech} AS has_required_tech,
+            row_number() OVER (
+              ORDER BY {holds_requested_tech} DESC, mp.sfia_level DESC
+            ) AS position
+          FROM {source} AS mp
+          WHERE {team_search_filter}
+          ORDER BY position
+          LIMIT :limit
         )
+        SELECT
+            CASE WHEN c.position IS NULL OR c.position = 1 THEN {team_document} END AS result,
+            c.*
+        FROM (SELECT 1) AS team
+        LEFT JOIN candidates c ON true
+        ORDER BY c.position
+        """,
+        "generation_candidates": f"""
+        SELECT{CANDIDATE_COLUMNS}
+        FROM {source} AS mp
+        WHERE mp.verification_status = :verification_status
+          AND mp.availability = :availability
+          AND (CAST(:min_sfia_level AS integer) IS NULL OR mp.sfia_level >= CAST(:min_sfia_level AS integer))
+          AND (
+            cardinality(CAST(:req_roles AS text[])) = 0
+            OR EXISTS (
+              SELECT 1
+              FROM unnest(
+                CAST(:req_roles AS text[]), CAST(:req_areas AS text[]), CAST(:req_levels AS text[])
+              ) AS req(role, area, level)
+              WHERE mp.role = req.role AND mp.technical_area = req.area AND mp.role_level = req.level
+            )
+          )
+          AND (cardinality(CAST(:techs AS text[])) = 0 OR mp.technologies && CAST(:techs AS text[]))
+          {PRIVACY_FILTER}
+        ORDER BY mp.sfia_level DESC
+        LIMIT :limit
+        """,
+        # Consenting profiles for the in-memory candidate index; NULL arrays load everyone
+        "index_rows": f"""
+        SELECT{CANDIDATE_COLUMNS},
+            mp.user_id,
+            mp.verification_status
+        FROM {source} AS mp
+        WHERE (
+            (CAST(:employee_ids AS uuid[]) IS NULL AND CAST(:user_ids AS uuid[]) IS NULL)
+            OR mp.employee_id = ANY(CAST(:employee_ids AS uuid[]))
+            OR mp.user_id = ANY(CAST(:user_ids AS uuid[]))
+          )
+          {PRIVACY_FILTER}
+        ORDER BY mp.employee_id, mp.role_key
+        """,
+    }
 
-        # Map level name to string for SQL filter (matching database storage)
-        level_map = {"Junior": "Junior", "Staff": "Staff", "Senior": "Senior", "Architect": "Architect"}
-        level = level_map.get(level_name) if level_name else None
-        level_filter = f" AND esr.level = '{level}'" if level is not None else ""
 
-        role_filter = f" AND sr.name = '{role}'" if role else ""
-        
-        # Handle multiple areas separated by commas
-        if area:
-            areas = [area.strip() for area in area.split(",")]
-            area_conditions = [f"ta.name = '{a}'" for a in areas if a]
-            if area_conditions:
-                area_filter = f" AND ({' OR '.join(area_conditions)})"
-            else:
-                area_filter = ""
-        else:
-            area_filter = ""
-
-        tech_list = technologies or []
-        tech_str = "','".join(tech_list)
-        tech_filter = (
-            f" AND EXISTS ("
-            f"SELECT 1 FROM public.employee_technologies et JOIN public.technologies tech ON tech.id = et.technology_id "
-            f"WHERE et.employee_profile_id = ep.id AND tech.name IN ('{tech_str}'))"
-            if tech_list
-            else ""
+MATCH_PROFILE_QUERIES = _profile_queries(MATCH_PROFILE_VIEW)
+LIVE_PROFILE_QUERIES = _profile_queries(f"({MATCH_PROFILE_SELECT}\n        )")
+
+
+class TeamDatabaseService:
+    def __init__(self, connection_string, min_size=None, max_size=None, statement_timeout_ms=None, command_timeout=None):
+        pool_options = {}
+        if min_size is not None:
+            pool_options["min_size"] = min_size
+        if max_size is not None:
+            pool_options["max_size"] = max_size
+        if command_timeout is not None:
+            pool_options["command_timeout"] = command_timeout
+        if statement_timeout_ms is not None:
+            # Applied server-side to every pooled connection
+            pool_options["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+
+        self.db = Database(connection_string, **pool_options)
+        self._acquire_count = 0
+        self._acquire_wait_total = 0.0
+        self._acquire_wait_max = 0.0
+
+        # Until use_match_profile finds the view the queries aggregate live data
+        self._queries = LIVE_PROFILE_QUERIES
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_count = 0
+        self._last_refresh_at = None
+        self._last_refresh_ms = None
+        self._last_refresh_error = None
+
+        # Optional in-memory CandidateIndex, used while it is fresh enough
+        self.candidate_index = None
+        self.candidate_index_max_staleness_s = None
+        self.candidate_index_hits = 0
+        self.candidate_index_fallbacks = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            settings.database_url,
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            statement_timeout_ms=settings.db_statement_timeout_ms,
+            command_timeout=settings.db_command_timeout_s,
         )
+        
+    async def connect(self):
+        await self.db.connect()
+        
+    async def disconnect(self):
+        await self.db.disconnect()
 
-        # Privacy filter - only include employees who consent to team matching
-        privacy_filter = self._get_privacy_filter()
+    @property
+    def match_profile_ready(self):
+        return self._queries is MATCH_PROFILE_QUERIES
 
-        sql = f"""
-        SELECT
-            ep.id AS employee_id,
-            ep.first_name || ' ' || ep.last_name AS name,
-            sr.name AS role,
-            ep.sfia_level_general AS sfia_level,
-            ep.mbti,
-            ep.timezone,
-            ep.country,
-            ep.availability,
-            ta.name AS technical_area,
-            (
-                SELECT jsonb_agg(DISTINCT tech.name)
-                FROM public.employee_technologies et
-                JOIN public.technologies tech ON tech.id = et.technology_id
-                WHERE et.employee_profile_id = ep.id
-            ) AS technologies,
-            (
-                SELECT jsonb_agg(DISTINCT pi.name)
-                FROM public.personal_interests pi
-                WHERE pi.employee_profile_id = ep.id
-            ) AS interests,
-            EXISTS (
-                SELECT 1 FROM public.employee_technologies et
-                JOIN public.technologies tech ON tech.id = et.technology_id
-                WHERE et.employee_profile_id = ep.id
-                  AND tech.name IN ('{tech_str}')
-            ) AS has_required_tech
-        FROM public.employee_profiles ep
-        LEFT JOIN public.employee_specialized_roles esr ON esr.employee_profile_id = ep.id
-        LEFT JOIN public.specialized_roles sr ON sr.id = esr.specialized_role_id
-        LEFT JOIN public.technical_areas ta ON ta.id = sr.technical_area_id
-        WHERE 1=1
-          {exclude_filter}
-          {role_filter}
-          {area_filter}
-          {level_filter}
-          {tech_filter}
-          {privacy_filter}
-        ORDER BY has_required_tech DESC, ep.sfia_level_general DESC
-        LIMIT 15;
+    async def use_match_profile(self):
+        """
+        Switches the queries over to the employee_match_profile materialized
+        view if the backend migration has created it; otherwise the live
+        queries keep being used.
         """
         try:
-            rows = await self.db.fetch_all(sql)
-            return [dict(r) for r in rows]
+            row = await self._fetch_one(
+                f"SELECT to_regclass('{MATCH_PROFILE_VIEW}') IS NOT NULL AS present", label="match_profile_check"
+            )
+            exists = row["present"]
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            self._last_refresh_error = str(e)
+            logger.warning("Match profile unavailable, using live queries: %s", e)
+            return False
+        if not exists:
+            self._last_refresh_error = f"{MATCH_PROFILE_VIEW} does not exist"
+            logger.warning(
+                "Match profile enabled but %s does not exist; apply the backend migration "
+                "EmployeeMatchProfile. Using live queries", MATCH_PROFILE_VIEW,
+            )
+            return False
+        self._queries = MATCH_PROFILE_QUERIES
+        return True
+
+    async def refresh_match_profile(self):
+        """
+        Rebuilds the match profile without blocking readers (CONCURRENTLY);
+        calls that arrive while a refresh is running wait for it and then
+        refresh again so they always see their own changes.
+        """
+        if not self.match_profile_ready:
+            return self.get_match_profile_stats()
+        async with self._refresh_lock:
+            started = time.perf_counter()
+            try:
+                async with self.db.connection() as connection:
+                    await connection.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {MATCH_PROFILE_VIEW}")
+            except Exception as e:
+                self._last_refresh_error = str(e)
+                raise
+            self._refresh_count += 1
+            self._last_refresh_at = time.time()
+            self._last_refresh_ms = (time.perf_counter() - started) * 1000
+            self._last_refresh_error = None
+        return self.get_match_profile_stats()
+
+    def attach_candidate_index(self, index, max_staleness_s):
+        self.candidate_index = index
+        self.candidate_index_max_staleness_s = max_staleness_s
+
+    def _use_candidate_index(self):
+        if self.candidate_index is None:
+            return False
+        if self.candidate_index.is_fresh(self.candidate_index_max_staleness_s):
+            self.candidate_index_hits += 1
+            return True
+        self.candidate_index_fallbacks += 1
+        return False
+
+    def get_match_profile_stats(self):
+        return {
+            "ready": self.match_profile_ready,
+            "refresh_count": self._refresh_count,
+            "last_refresh_at": self._last_refresh_at,
+            "last_refresh_ms": self._last_refresh_ms,
+            "staleness_s": time.time() - self._last_refresh_at if self._last_refresh_at else None,
+            "last_error": self._last_refresh_error,
+        }
+
+    def get_pool_stats(self):
+        """
+        Returns a snapshot of the connection pool usage so it can be sized.
+
+        Wait times measure how long a query waited to acquire a pooled
+        connection, not how long the query itself took.
+        """
+        pool = getattr(self.db._backend, "_pool", None)
+        size = pool.get_size() if pool else 0
+        idle = pool.get_idle_size() if pool else 0
+        return {
+            "connected": self.db.is_connected,
+            "min_size": pool.get_min_size() if pool else None,
+            "max_size": pool.get_max_size() if pool else None,
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "acquire_count": self._acquire_count,
+            "acquire_wait_avg_ms": (
+                self._acquire_wait_total / self._acquire_count * 1000 if self._acquire_count else 0.0
+            ),
+            "acquire_wait_max_ms": self._acquire_wait_max * 1000,
+        }
+
+    def _record_acquire_wait(self, started):
+        waited = time.perf_counter() - started
+        self._acquire_count += 1
+        self._acquire_wait_total += waited
+        self._acquire_wait_max = max(self._acquire_wait_max, waited)
+
+    async def _fetch_all(self, query, values=None, label="query"):
+        started = time.perf_counter()
+        with timed("db", DB_FETCH_SECONDS, query=label):
+            async with self.db.connection() as connection:
+                self._record_acquire_wait(started)
+                return await connection.fetch_all(query, values)
+
+    async def _fetch_one(self, query, values=None, label="query"):
+        started = time.perf_counter()
+        with timed("db", DB_FETCH_SECONDS, query=label):
+            async with self.db.connection() as connection:
+                self._record_acquire_wait(started)
+                return await connection.fetch_one(query, values)
+
+    async def get_team_data(self, team_id):
+        result = await self._fetch_one(self._queries["team_data"], {"team_id": team_id}, label="team_data")
+        if not result:
+            return None
+        return _decode_json(result["result"])
     
-    async def get_generation_candidates(self, requirements, technologies, min_sfia_level, availability):
-        # Build OR conditions for each requirement
-        # Map level names to their string representations (matching the database)
-        level_map = {"Junior": "Junior", "Staff": "Staff", "Senior": "Senior", "Architect": "Architect"}
-        req_clauses = []
-        
-        print(f"DEBUG - get_generation_candidates requirements: {requirements}")
-        
-        for req in requirements:
-            print(f"DEBUG - Processing requirement: {req}")
-            raw_level = req.get("Level")
-            
-            # Handle both string and potential numeric level values
-            if isinstance(raw_level, int):
-                # If you have a numeric mapping, convert it here
-                numeric_to_string = {0: "Junior", 1: "Staff", 2: "Senior", 3: "Architect"}
-                level_name = numeric_to_string.get(raw_level)
-            else:
-                level_name = level_map.get(raw_level)
-                
-            print(f"DEBUG - Original level: {raw_level}, mapped level: {level_name}")
-            
-            if req.get("Role") and req.get("Area") and level_name:
-                # Handle multiple areas separated by commas
-                areas = [area.strip() for area in req.get("Area", "").split(",")]
-                area_conditions = []
-                for area in areas:
-                    if area:  # Skip empty areas
-                        area_conditions.append(f"ta.name = '{area}'")
-                
-                if area_conditions:
-                    area_clause = " OR ".join(area_conditions)
-                    clause = f"(sr.name = '{req['Role']}' AND ({area_clause}) AND esr.level = '{level_name}')"
-                    print(f"DEBUG - Generated clause: {clause}")
-                    req_clauses.append(clause)
-        req_filter = f"AND ({' OR '.join(req_clauses)})" if req_clauses else ""
-        print(f"DEBUG - Final req_filter: {req_filter}")
-
-        # Technologies filter
-        tech_list = technologies or []
-        tech_str = "','".join(tech_list)
-        tech_filter = (
-            f"AND EXISTS (SELECT 1 FROM public.employee_technologies et JOIN public.technologies tech ON tech.id = et.technology_id "
-            f"WHERE et.employee_profile_id = ep.id AND tech.name IN ('{tech_str}'))"
-            if tech_list else ""
+    @staticmethod
+    def _team_candidate_values(team_id, role, area, level_name, technologies, limit):
+        return {
+            "team_id": team_id,
+            "role": role or None,
+            "areas": split_areas(area),
+            "level": parse_level(level_name),
+            "techs": list(technologies or []),
+            "limit": limit,
+        }
+
+    async def get_team_search_data(self, team_id, role, area, level_name, technologies, limit=15):
+        """
+        The team document (see get_team_data, plus "member_ids") and the
+        `limit` candidates most similar to the request by skill (see
+        skill_index). Returns (team_data, candidates).
+
+        The candidate index ranks every row that passes the role, area and
+        level filters; without it a single statement reads the team and
+        SQL_SEARCH_POOL_FACTOR times `limit` candidates, holders of the
+        requested technologies and higher SFIA levels first, and that pool
+        is ranked the same way.
+        """
+        if self._use_candidate_index():
+            team_data = await self.get_team_data(team_id)
+            member_ids = (team_data or {}).get("member_ids") or []
+            members = (team_data or {}).get("members") or []
+            return team_data, self.candidate_index.team_candidates(
+                member_ids, role, area, level_name, technologies, limit=limit, members=members
+            )
+
+        values = self._team_candidate_values(
+            team_id, role, area, level_name, technologies, limit * SQL_SEARCH_POOL_FACTOR
         )
+        team_data, candidates = await self._team_search_pool(values)
+        members = (team_data or {}).get("members") or []
+        return team_data, rank_rows(candidates, technologies, values["areas"], members, limit)
 
-        verification_value = "2"  # Approved status as string
+    async def _team_search_pool(self, values):
+        """The team_search statement: the team document and its unranked candidate pool."""
+        try:
+            rows = await self._fetch_all(self._queries["team_search"], values, label="team_search")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        if not rows:
+            return None, []
+        team_data = _decode_json(rows[0]["result"])
+        candidates = []
+        for row in rows:
+            if row["employee_id"] is None:
+                continue
+            candidate = _row_to_dict(row)
+            del candidate["result"], candidate["position"]
+            candidates.append(candidate)
+        return team_data, candidates
 
-        # Availability and SFIA level filter
-        avail_filter = f"AND ep.availability = {str(availability).lower()}"
-        sfia_filter = f"AND ep.sfia_level_general >= {min_sfia_level}" if min_sfia_level is not None else ""
-        verification_filter = f"AND ep.verification_status = '{verification_value}'"
-        
-        # Privacy filter - only include employees who consent to team matching
-        privacy_filter = self._get_privacy_filter()
+    async def get_generation_candidates(self, requirements, technologies, min_sfia_level, availability, limit=20):
+        logger.debug("get_generation_candidates requirements: %s", requirements)
+        if self._use_candidate_index():
+            return self.candidate_index.generation_candidates(
+                requirements, technologies, min_sfia_level, availability, limit=limit
+            )
 
-        sql = f"""
-        SELECT
-            ep.id AS employee_id,
-            ep.first_name || ' ' || ep.last_name AS name,
-            sr.name AS role,
-            ta.name AS technical_area,
-            ep.sfia_level_general AS sfia_level,
-            ep.mbti,
-            ep.timezone,
-            ep.country,
-            ep.availability,
-            (
-                SELECT jsonb_agg(DISTINCT tech.name)
-                FROM public.employee_technologies et
-                JOIN public.technologies tech ON tech.id = et.technology_id
-                WHERE et.employee_profile_id = ep.id
-            ) AS technologies,
-            (
-                SELECT jsonb_agg(DISTINCT pi.name)
-                FROM public.personal_interests pi
-                WHERE pi.employee_profile_id = ep.id
-            ) AS interests
-        FROM public.employee_profiles ep
-        LEFT JOIN public.employee_specialized_roles esr ON esr.employee_profile_id = ep.id
-        LEFT JOIN public.specialized_roles sr ON sr.id = esr.specialized_role_id
-        LEFT JOIN public.technical_areas ta ON ta.id = sr.technical_area_id
-        WHERE 1=1
-          {avail_filter}
-          {sfia_filter}
-          {verification_filter}
-          {req_filter}
-          {tech_filter}
-          {privacy_filter}
-        ORDER BY ep.sfia_level_general DESC
-        LIMIT 20;
-        """
+        # One (role, area, level) tuple per requirement area, bound as three parallel arrays
+        req_roles, req_areas, req_levels = [], [], []
+        for req in requirements:
+            level = parse_level(req.get("Level"))
+            if not (req.get("Role") and req.get("Area") and level):
+                continue
+            for area in split_areas(req.get("Area")):
+                req_roles.append(req["Role"])
+                req_areas.append(area)
+                req_levels.append(level)
+
+        values = {
+            "availability": bool(availability),
+            "min_sfia_level": min_sfia_level,
+            "verification_status": APPROVED_VERIFICATION_STATUS,
+            "req_roles": req_roles,
+            "req_areas": req_areas,
+            "req_levels": req_levels,
+            "techs": list(technologies or []),
+            "limit": limit,
+        }
         try:
-            rows = await self.db.fetch_all(sql)
-            return [dict(r) for r in rows]
+            rows = await self._fetch_all(
+                self._queries["generation_candidates"], values, label="generation_candidates"
+            )
+            return [_row_to_dict(r) for r in rows]
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
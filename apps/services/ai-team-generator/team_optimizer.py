@@ -0,0 +1,320 @@
+"""
+Assigns candidates to the TechnicalRoleSpec slots of a team generation request.
+
+The objective is the sum of every member's individual score plus the
+pairwise compatibility between members (MBTI complement, shared interests,
+timezone overlap), scaled by the weight those interpersonal criteria carry
+in the request. Small pools are solved exactly with branch and bound;
+larger ones with beam search followed by a local-search pass.
+"""
+import heapq
+import math
+
+import numpy as np
+
+from scoring import pairwise_compatibility
+
+LEVEL_NAMES = ("Junior", "Staff", "Senior", "Architect")
+
+# Above this many combinations the exact search hands over to beam search
+EXACT_SEARCH_LIMIT = 50_000
+BEAM_WIDTH = 64
+LOCAL_SEARCH_ROUNDS = 10
+
+
+class TeamAssignment:
+    """
+    A team chosen by the optimizer: one candidate row index per slot.
+    `alternatives` holds the next-best distinct teams, best first.
+    """
+
+    def __init__(self, indices, slots, score):
+        self.indices = indices
+        self.slots = slots
+        self.score = score
+        self.alternatives = []
+
+
+def _level_name(level):
+    if isinstance(level, int):
+        return LEVEL_NAMES[level] if 0 <= level < len(LEVEL_NAMES) else None
+    return level or None
+
+
+def build_slots(requirements, team_size):
+    """One slot per requirement, trimmed or padded with open slots (None) to team_size."""
+    slots = [
+        {"role": req.get("Role"), "area": req.get("Area"), "level": _level_name(req.get("Level"))}
+        for req in requirements[:team_size]
+    ]
+    return slots + [None] * (team_size - len(slots))
+
+
+def _slot_matches(row, slot):
+    role = (slot.get("role") or "").strip().lower()
+    areas = {a.strip().lower() for a in (slot.get("area") or "").split(",") if a.strip()}
+    level = slot.get("level")
+    return (
+        (not role or (row.get("role") or "").strip().lower() == role)
+        and (not areas or (row.get("technical_area") or "").strip().lower() in areas)
+        and (not level or row.get("role_level") == level)
+    )
+
+
+def eligibility_matrix(rows, slots):
+    """
+    Boolean (candidates x slots) matrix of who can fill each slot.
+
+    A slot nobody matches exactly is opened to every candidate so the team
+    can still reach team_size.
+    """
+    eligible = np.ones((len(rows), len(slots)), dtype=bool)
+    for s, slot in enumerate(slots):
+        if slot is None:
+            continue
+        column = np.array([_slot_matches(row, slot) for row in rows], dtype=bool)
+        if column.any():
+            eligible[:, s] = column
+    return eligible
+
+
+class _Problem:
+    def __init__(self, scores, slots, eligible, persons, pairwise, pair_share):
+        self.slots = slots
+        self.eligible = eligible
+        self.persons = persons
+        self.unary = scores.totals / 100.0
+        self.pairwise = pairwise
+        self.k = len(slots)
+        self.pair_scale = pair_share * 2.0 / (self.k - 1) if self.k > 1 else 0.0
+        self.pair_share = pair_share
+
+        # Identical slots are visited consecutively and filled in increasing
+        # row order so the same set of people is not explored in every order
+        signatures = [repr(sorted(slot.items())) if slot else "" for slot in slots]
+        self.order = sorted(range(self.k), key=lambda s: (int(eligible[:, s].sum()), signatures[s]))
+        self.same_as_previous = [
+            depth > 0 and signatures[self.order[depth]] == signatures[self.order[depth - 1]]
+            for depth in range(self.k)
+        ]
+        self.candidates = [
+            sorted(np.flatnonzero(eligible[:, s]), key=lambda i: -self.unary[i]) for s in self.order
+        ]
+        self.candidate_arrays = [np.array(cands, dtype=np.intp) for cands in self.candidates]
+
+    def gain(self, candidate, chosen):
+        return self.unary[candidate] + self.pair_scale * self.pairwise[candidate, chosen].sum()
+
+    def gains(self, depth, chosen):
+        """gain() of every candidate of slot `depth` at once."""
+        cands = self.candidate_arrays[depth]
+        if not chosen:
+            return self.unary[cands]
+        return self.unary[cands] + self.pair_scale * self.pairwise[np.ix_(cands, chosen)].sum(axis=1)
+
+    def allowed_mask(self, depth, chosen, used):
+        """allowed() of every candidate of slot `depth` at once."""
+        cands = self.candidate_arrays[depth]
+        mask = ~np.isin(self.persons[cands], list(used))
+        if self.same_as_previous[depth] and chosen:
+            mask &= cands > chosen[-1]
+        return mask
+
+    def allowed(self, depth, candidate, chosen, used):
+        if self.persons[candidate] in used:
+            return False
+        return not (self.same_as_previous[depth] and chosen and candidate <= chosen[-1])
+
+    def normalized(self, objective, size):
+        # Objective per member, rescaled to 0-100 (pairwise term bounded by pair_share)
+        return 100.0 * objective / (size * (1.0 + self.pair_share)) if size else 0.0
+
+    def search_space(self):
+        total = 1
+        depth = 0
+        while depth < self.k:
+            run = 1
+            while depth + run < self.k and self.same_as_previous[depth + run]:
+                run += 1
+            total *= math.comb(len(self.candidates[depth]), run)
+            depth += run
+        return total
+
+    def team_key(self, chosen):
+        return frozenset(self.persons[c] for c in chosen)
+
+    def objective(self, chosen):
+        chosen = list(chosen)
+        total = float(self.unary[chosen].sum())
+        for position, candidate in enumerate(chosen):
+            total += self.pair_scale * float(self.pairwise[candidate, chosen[:position]].sum())
+        return total
+
+
+class _TopTeams:
+    """The `count` best teams seen so far, one entry per distinct set of people."""
+
+    def __init__(self, problem, count):
+        self.problem = problem
+        self.count = count
+        self.teams = {}
+        self.threshold = -math.inf
+
+    def offer(self, objective, chosen):
+        key = self.problem.team_key(chosen)
+        if key in self.teams and self.teams[key][0] >= objective:
+            return
+        self.teams[key] = (objective, list(chosen))
+        if len(self.teams) > self.count:
+            del self.teams[min(self.teams, key=lambda k: self.teams[k][0])]
+        if len(self.teams) == self.count:
+            self.threshold = min(objective for objective, _ in self.teams.values())
+
+    def ranked(self):
+        return [chosen for _, chosen in sorted(self.teams.values(), key=lambda item: -item[0])]
+
+
+def _exact_search(problem, count=1):
+    top = _TopTeams(problem, count)
+    max_unary = [max((problem.unary[c] for c in cands), default=0.0) for cands in problem.candidates]
+    suffix_unary = np.concatenate([np.cumsum(max_unary[::-1])[::-1], [0.0]])
+    max_pair = float(problem.pairwise.max()) if problem.pairwise.size else 0.0
+
+    def dfs(depth, chosen, used, partial):
+        if depth == problem.k:
+            if partial > top.threshold:
+                top.offer(partial, chosen)
+            return
+        remaining = problem.k - depth
+        open_pairs = remaining * depth + remaining * (remaining - 1) / 2
+        if partial + suffix_unary[depth] + problem.pair_scale * max_pair * open_pairs <= top.threshold:
+            return
+        for candidate in problem.candidates[depth]:
+            if not problem.allowed(depth, candidate, chosen, used):
+                continue
+            chosen.append(candidate)
+            used.add(problem.persons[candidate])
+            dfs(depth + 1, chosen, used, partial + problem.gain(candidate, chosen[:-1]))
+            used.discard(problem.persons[candidate])
+            chosen.pop()
+
+    dfs(0, [], set(), 0.0)
+    return top.ranked()
+
+
+def _beam_search(problem, beam_width=BEAM_WIDTH, count=1):
+    beam = [(0.0, [], frozenset())]
+    for depth in range(problem.k):
+        expansions = {}
+        cands = problem.candidate_arrays[depth]
+        for partial, chosen, used in beam:
+            allowed = np.flatnonzero(problem.allowed_mask(depth, chosen, used))
+            objectives = partial + problem.gains(depth, chosen)[allowed]
+            # Best first: once this team has supplied beam_width kept
+            # expansions, its worse ones can no longer enter the beam
+            kept = 0
+            for i in np.argsort(-objectives, kind="stable"):
+                candidate, objective = int(cands[allowed[i]]), float(objectives[i])
+                key = frozenset(chosen) | {candidate}
+                if key not in expansions or expansions[key][0] < objective:
+                    expansions[key] = (objective, chosen + [candidate], used | {problem.persons[candidate]})
+                    kept += 1
+                    if kept == beam_width:
+                        break
+        if not expansions:
+            break
+        beam = heapq.nlargest(beam_width, expansions.values(), key=lambda item: item[0])
+
+    # The final beam already holds distinct complete teams, best first. Local
+    # search polishes the best `count` and often lands several on the same
+    # optimum, so the unpolished teams stay in the running as alternatives
+    top = _TopTeams(problem, count)
+    complete = [(objective, chosen) for objective, chosen, _ in beam if len(chosen) == problem.k]
+    for position, (objective, chosen) in enumerate(complete):
+        top.offer(objective, chosen)
+        if position < count:
+            polished = _local_search(problem, chosen)
+            top.offer(problem.objective(polished), polished)
+    return top.ranked()
+
+
+def _local_search(problem, chosen):
+    """Replaces one member at a time while that strictly improves the objective."""
+    chosen = list(chosen)
+    for _ in range(LOCAL_SEARCH_ROUNDS):
+        improved = False
+        for position in range(len(chosen)):
+            current = chosen[position]
+            others = chosen[:position] + chosen[position + 1:]
+            cands = problem.candidate_arrays[position]
+            gains = np.where(
+                np.isin(problem.persons[cands], problem.persons[others]) | (cands == current),
+                -np.inf,
+                problem.gains(position, others),
+            )
+            best = int(np.argmax(gains)) if len(cands) else None
+            if best is not None and gains[best] > problem.gain(current, others) + 1e-9:
+                chosen[position] = int(cands[best])
+                improved = True
+        if not improved:
+            break
+    return chosen
+
+
+def optimize_team(scores, requirements, team_size, weights, exact_limit=EXACT_SEARCH_LIMIT, alternatives=1):
+    """
+    Picks the team that maximizes total weighted compatibility.
+
+    `scores` is the ScoreMatrix of the candidate rows, `requirements` the
+    request's role/area/level dicts (by alias). Each employee appears at most
+    once even if they have several specialized-role rows. With
+    `alternatives` > 1 the same search also keeps the next-best teams with a
+    different set of people, returned in `assignment.alternatives`.
+    """
+    rows = scores.rows
+    person_index = {}
+    persons = np.array([person_index.setdefault(str(r["employee_id"]), len(person_index)) for r in rows])
+    size = min(team_size, len(person_index))
+    slots = build_slots(requirements, size)
+    if not slots:
+        return None
+
+    pairwise, pair_share = pairwise_compatibility(scores.people if scores.people is not None else rows, weights)
+    eligible = eligibility_matrix(rows, slots)
+    ranked = []
+    # If the slots cannot all be filled with distinct people, open them up
+    for candidate_eligibility in (eligible, np.ones_like(eligible)):
+        problem = _Problem(scores, slots, candidate_eligibility, persons, pairwise, pair_share)
+        if problem.search_space() <= exact_limit:
+            ranked = _exact_search(problem, count=alternatives)
+        else:
+            ranked = _beam_search(problem, count=alternatives)
+        if ranked:
+            break
+    if not ranked:
+        return None
+
+    assignments = []
+    for chosen in ranked:
+        by_slot = [None] * problem.k
+        for depth, candidate in enumerate(chosen):
+            by_slot[problem.order[depth]] = int(candidate)
+        assignments.append(TeamAssignment(by_slot, slots, problem.normalized(problem.objective(chosen), len(chosen))))
+    best = assignments[0]
+    best.alternatives = assignments[1:]
+    return best
+
+
+def alternate_candidates(scores, assignment, limit=3, exclude=()):
+    """Best-scored candidates that are not already on the team (nor in `exclude`, by employee id)."""
+    taken = {str(scores.rows[i]["employee_id"]) for i in assignment.indices} | {str(e) for e in exclude}
+    alternates = []
+    for index in scores.ranked_indices():
+        employee_id = str(scores.rows[index]["employee_id"])
+        if employee_id in taken:
+            continue
+        taken.add(employee_id)
+        alternates.append(int(index))
+        if len(alternates) == limit:
+            break
+    return alternates
@@ -0,0 +1,325 @@
+"""
+Per-team compatibility state for incremental /reanalyze-team.
+
+A team's score is kept as running sums: the pairwise MBTI, language,
+interest and timezone scores of every pair of members, their individual
+SFIA and experience scores, and how many members cover each required
+technology. Adding or removing a member only scores that person against
+the rest of the team, so a change costs O(team size) instead of rescoring
+every pair.
+
+Each state also remembers the last narrative the model wrote and which
+members it described. A reanalysis whose members match that narrative
+reuses it without calling the model; otherwise the model is only asked to
+update it for the members that joined or left. The first state of a team
+starts from the members stored in the database and, when the team's
+weights still match, from the analysis stored in teams.ai_analysis.
+"""
+import json
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from result_cache import fingerprint_rows
+from scoring import CRITERIA, PAIRWISE_CRITERIA, individual_scores, pair_scores, weights_vector
+
+
+# What the team score and the narrative read from a member
+MEMBER_FIELDS = ("role", "role_level", "years_experience", "sfia_level", "mbti", "timezone", "country")
+MEMBER_LIST_FIELDS = ("technologies", "interests", "languages")
+
+
+def _lowered(values):
+    return {str(value).strip().lower() for value in (values or []) if value}
+
+
+def member_key(member) -> str:
+    """Stable identity of a member dict, whichever id column it carries."""
+    for column in ("profile_id", "employee_id", "id"):
+        if member.get(column):
+            return str(member[column])
+    return fingerprint_rows([member])
+
+
+def member_name(member) -> str:
+    name = member.get("name") or " ".join(
+        part for part in (member.get("first_name"), member.get("last_name")) if part
+    )
+    return name or member_key(member)
+
+
+def team_member(member) -> dict:
+    """
+    `member` in the one shape a state keeps, whether it is a stored team
+    member (profile_id, first_name, ...) or a request's member (employee_id,
+    name, ...): its id, name and the fields it is scored on, lists sorted.
+    Two dicts for the same unchanged person compare equal.
+    """
+    normalized = {"id": member_key(member), "name": member_name(member)}
+    for field in MEMBER_FIELDS:
+        normalized[field] = member.get(field)
+    for field in MEMBER_LIST_FIELDS:
+        normalized[field] = sorted({str(value).strip() for value in (member.get(field) or []) if value})
+    return normalized
+
+
+class TeamCompatibility:
+    """Running sums behind one team's compatibility score."""
+
+    def __init__(self, weights, technologies):
+        self.weights = weights_vector(weights)
+        self.technologies = sorted(_lowered(technologies))
+        self.members = {}
+        self._pairs = {}
+        self._pair_sum = np.zeros(len(PAIRWISE_CRITERIA))
+        self._individual_sum = np.zeros(2)
+        self._tech_counts = dict.fromkeys(self.technologies, 0)
+
+    def matches(self, weights, technologies) -> bool:
+        return np.allclose(self.weights, weights_vector(weights)) and self.technologies == sorted(_lowered(technologies))
+
+    def add(self, member):
+        member = team_member(member)
+        key = member["id"]
+        if key in self.members:
+            self.remove(key)
+        others = list(self.members)
+        scores = pair_scores(member, [self.members[other] for other in others])
+        pairs = dict(zip(others, scores))
+        for other, score in pairs.items():
+            self._pairs[other][key] = score
+        self._pairs[key] = pairs
+        self._pair_sum += scores.sum(axis=0)
+        individual = individual_scores(member)
+        self._individual_sum += (individual["sfia"], individual["experience"])
+        for technology in _lowered(member.get("technologies")) & self._tech_counts.keys():
+            self._tech_counts[technology] += 1
+        self.members[key] = member
+
+    def remove(self, key):
+        member = self.members.pop(key)
+        for other, score in self._pairs.pop(key).items():
+            del self._pairs[other][key]
+            self._pair_sum -= score
+        individual = individual_scores(member)
+        self._individual_sum -= (individual["sfia"], individual["experience"])
+        for technology in _lowered(member.get("technologies")) & self._tech_counts.keys():
+            self._tech_counts[technology] -= 1
+        return member
+
+    def sync(self, members):
+        """
+        Brings the state to `members`: people no longer listed are removed,
+        new or changed profiles are (re)added. Returns the number of people
+        scored against the team.
+        """
+        incoming = {member["id"]: member for member in map(team_member, members)}
+        for key in [key for key in self.members if key not in incoming]:
+            self.remove(key)
+        changed = 0
+        for key, member in incoming.items():
+            if self.members.get(key) != member:
+                self.add(member)
+                changed += 1
+        return changed
+
+    def criteria(self) -> dict:
+        """Every criterion in [0, 1] for the team as a whole."""
+        n = len(self.members)
+        pair_count = n * (n - 1) / 2
+        pairwise = self._pair_sum / pair_count if pair_count else np.full(len(PAIRWISE_CRITERIA), 0.5)
+        individual = self._individual_sum / n if n else np.zeros(2)
+        covered = sum(1 for count in self._tech_counts.values() if count > 0)
+        values = dict(zip(PAIRWISE_CRITERIA, pairwise.tolist()))
+        values["sfia"], values["experience"] = individual.tolist()
+        values["technical"] = covered / len(self.technologies) if self.technologies else 1.0
+        return {criterion: float(values[criterion]) for criterion in CRITERIA}
+
+    def score(self) -> int:
+        criteria = self.criteria()
+        return int(round(float(np.dot(self.weights, [criteria[c] for c in CRITERIA])) * 100))
+
+    def breakdown(self) -> dict:
+        return {criterion: round(value * 100, 1) for criterion, value in self.criteria().items()}
+
+    def missing_technologies(self) -> list[str]:
+        return [technology for technology, count in self._tech_counts.items() if count == 0]
+
+    def member_fit(self, key) -> dict:
+        """Mean pairwise score (0-100) of one member with the rest of the team."""
+        pairs = self._pairs.get(key) or {}
+        if not pairs:
+            return {}
+        means = np.mean(list(pairs.values()), axis=0)
+        return {criterion: round(float(value) * 100, 1) for criterion, value in zip(PAIRWISE_CRITERIA, means)}
+
+
+def stored_analysis(team):
+    """The teams.ai_analysis document as a reanalysis narrative, or None."""
+    analysis = (team or {}).get("ai_analysis")
+    if isinstance(analysis, str):
+        try:
+            analysis = json.loads(analysis)
+        except ValueError:
+            return None
+    if not isinstance(analysis, dict):
+        return None
+    fields = {key.lower(): value for key, value in analysis.items()}
+    if not (fields.get("strengths") or fields.get("compatibility")):
+        return None
+    return {
+        "updated_strengths": list(fields.get("strengths") or []),
+        "updated_weaknesses": list(fields.get("weaknesses") or []),
+        "detailed_analysis": fields.get("compatibility") or "",
+        "recommendations": list(fields.get("recommendations") or []),
+    }
+
+
+def _team_weights(team):
+    weights = (team or {}).get("weight_criteria")
+    if isinstance(weights, str):
+        try:
+            weights = json.loads(weights)
+        except ValueError:
+            return None
+    return weights if isinstance(weights, dict) else None
+
+
+class TeamState:
+    """A team's compatibility sums plus the narrative last written for it."""
+
+    def __init__(self, compatibility, analysis=None, analysis_members=None, creator_id=None):
+        self.compatibility = compatibility
+        # Whose usage cap the team's model calls count against
+        self.creator_id = creator_id
+        self.analysis = analysis
+        # Members the narrative describes, by key
+        self.analysis_members = dict(analysis_members or {})
+        self.updated_at = time.monotonic()
+
+    @classmethod
+    def from_team(cls, team_data, weights, technologies):
+        """
+        Starts from the team as stored: its members and, if it was written
+        for the same weights, its teams.ai_analysis.
+        """
+        compatibility = TeamCompatibility(weights, technologies)
+        members = (team_data or {}).get("members") or []
+        for member in members:
+            compatibility.add(member)
+        team = (team_data or {}).get("team")
+        team_weights = _team_weights(team)
+        analysis = None
+        if members and team_weights is not None and np.allclose(weights_vector(team_weights), compatibility.weights):
+            analysis = stored_analysis(team)
+        analysis_members = compatibility.members if analysis else {}
+        creator_id = (team or {}).get("creator_id")
+        return cls(compatibility, analysis, analysis_members, str(creator_id) if creator_id else None)
+
+    def update(self, members) -> dict:
+        """
+        Applies the request's member list and returns what changed since the
+        last narrative: scores before and after, the members who joined or
+        left, the rest of the team and the previous narrative.
+        """
+        compatibility = self.compatibility
+        score_before = compatibility.score() if compatibility.members else None
+        breakdown_before = compatibility.breakdown() if compatibility.members else None
+        rescored = compatibility.sync(members)
+        self.updated_at = time.monotonic()
+
+        current = compatibility.members
+        if self.analysis is None:
+            added, removed, unchanged = list(current), [], []
+        else:
+            added = [key for key in current if key not in self.analysis_members]
+            removed = [key for key in self.analysis_members if key not in current]
+            unchanged = [key for key in current if key in self.analysis_members]
+        return {
+            "score_before": score_before,
+            "score": compatibility.score(),
+            "breakdown_before": breakdown_before,
+            "breakdown": compatibility.breakdown(),
+            "missing_technologies": compatibility.missing_technologies(),
+            "added": [{**current[key], "team_fit": compatibility.member_fit(key)} for key in added],
+            "removed": [self.analysis_members[key] for key in removed],
+            "unchanged": [current[key] for key in unchanged],
+            "previous_analysis": self.analysis,
+            "rescored": rescored,
+        }
+
+    @staticmethod
+    def needs_narrative(change) -> bool:
+        return change["previous_analysis"] is None or bool(change["added"] or change["removed"])
+
+    def remember(self, analysis):
+        """Keeps `analysis` as the narrative of the current members."""
+        self.analysis = analysis
+        self.analysis_members = dict(self.compatibility.members)
+
+
+class TeamStateStore:
+    """In-memory LRU of TeamState per team id."""
+
+    def __init__(self, max_teams=1000):
+        self.max_teams = max_teams
+        self._states = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+        self.rescored_members = 0
+        self.updates = 0
+        self.narratives = 0
+        self.reused = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(max_teams=settings.team_state_max_teams)
+
+    def get(self, team_id, weights, technologies):
+        """The team's state when it exists for these weights and technologies, else None."""
+        state = self._states.get(team_id)
+        if state is None or not state.compatibility.matches(weights, technologies):
+            return None
+        self._states.move_to_end(team_id)
+        self.hits += 1
+        return state
+
+    def put(self, team_id, state):
+        self.builds += 1
+        if self.max_teams <= 0:
+            return
+        self._states[team_id] = state
+        self._states.move_to_end(team_id)
+        while len(self._states) > self.max_teams:
+            self._states.popitem(last=False)
+            self.evictions += 1
+
+    def record(self, change, narrative):
+        self.updates += 1
+        self.rescored_members += change["rescored"]
+        if narrative:
+            self.narratives += 1
+        else:
+            self.reused += 1
+
+    def invalidate(self, team_id=None) -> int:
+        if team_id is None:
+            removed = len(self._states)
+            self._states.clear()
+            return removed
+        return 1 if self._states.pop(team_id, None) is not None else 0
+
+    def get_stats(self):
+        return {
+            "teams": len(self._states),
+            "max_teams": self.max_teams,
+            "hits": self.hits,
+            "builds": self.builds,
+            "evictions": self.evictions,
+            "updates": self.updates,
+            "avg_rescored_members": self.rescored_members / self.updates if self.updates else 0.0,
+            "model_narratives": self.narratives,
+            "reused_narratives": self.reused,
+        }
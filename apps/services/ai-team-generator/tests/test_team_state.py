@@ -0,0 +1,74 @@
+import unittest
+
+from team_state import TeamState
+
+WEIGHTS = {
+    "sfia_weight": 20,
+    "technical_weight": 20,
+    "psychological_weight": 20,
+    "experience_weight": 10,
+    "language_weight": 10,
+    "interests_weight": 10,
+    "timezone_weight": 10,
+}
+TECHNOLOGIES = ["Python", "React"]
+
+PEOPLE = [
+    ("6f1c2b3e-0000-4000-8000-000000000001", "Ana", "Pérez", "Developer", "Senior", 6, 5, "INTJ",
+     ["Python", "React"], ["Music"], ["Spanish", "English"]),
+    ("6f1c2b3e-0000-4000-8000-000000000002", "Luis", "Gómez", "QA", "Staff", 3, 3, "ENFP",
+     ["Java", "Python"], ["Sports", "Travel"], ["Spanish"]),
+    ("6f1c2b3e-0000-4000-8000-000000000003", "Marta", "Ruiz", "DevOps", "Architect", 12, 6, "ISTJ",
+     ["Docker", "AWS"], [], ["English"]),
+]
+
+
+def stored_member(person):
+    """A member as get_team_data reads it from the database."""
+    profile_id, first, last, role, level, years, sfia, mbti, techs, interests, languages = person
+    return {
+        "profile_id": profile_id, "first_name": first, "last_name": last, "role": role, "role_level": level,
+        "years_experience": years, "sfia_level": sfia, "mbti": mbti, "timezone": "America/La_Paz",
+        "country": "Bolivia", "availability": True, "technologies": sorted(techs),
+        "interests": sorted(interests), "languages": sorted(languages),
+    }
+
+
+def request_member(person):
+    """The same member as a /reanalyze-team request sends it: a candidate row, lists in any order."""
+    employee_id, first, last, role, level, years, sfia, mbti, techs, interests, languages = person
+    return {
+        "employee_id": employee_id, "name": f"{first} {last}", "role": role, "technical_area": "Backend",
+        "role_level": level, "years_experience": years, "sfia_level": sfia, "mbti": mbti,
+        "timezone": "America/La_Paz", "country": "Bolivia", "availability": True, "verification_status": "2",
+        "technologies": list(reversed(techs)), "interests": list(reversed(interests)),
+        "languages": list(reversed(languages)),
+    }
+
+
+class TeamStateUpdateTest(unittest.TestCase):
+    def state(self):
+        team_data = {"members": [stored_member(person) for person in PEOPLE]}
+        return TeamState.from_team(team_data, WEIGHTS, TECHNOLOGIES)
+
+    def test_unchanged_team_rescored_nobody(self):
+        state = self.state()
+        score = state.compatibility.score()
+        change = state.update([request_member(person) for person in PEOPLE])
+        self.assertEqual(change["rescored"], 0)
+        self.assertEqual(change["score"], score)
+
+    def test_new_member_only_rescored(self):
+        state = self.state()
+        members = [request_member(person) for person in PEOPLE]
+        members.append(request_member(
+            ("6f1c2b3e-0000-4000-8000-000000000004", "Sara", "León", "Designer", "Junior", 1, 2, "ESFJ",
+             ["Figma"], ["Photography"], ["Portuguese"])
+        ))
+        change = state.update(members)
+        self.assertEqual(change["rescored"], 1)
+        self.assertEqual(len(state.compatibility.members), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Prompt token budgets, answer sizing and per-creator usage accounting.
+
+Before a model call the prompt is measured (the static prefix with its
+counted or estimated size, the dynamic suffix with `estimate_tokens`) and,
+when it does not fit the endpoint's input budget, the lowest-ranked
+candidates are dropped until it does. `max_tokens` grows with the number of
+people the answer has to talk about instead of being a fixed ceiling.
+
+`UsageLedger` adds up the `usage` of every response per endpoint and per
+creator, and refuses new calls for a creator that has spent its cap in the
+current window.
+"""
+import time
+
+from prompts import estimate_tokens
+
+# Answer size per endpoint: fixed part, tokens per person described, ceiling
+OUTPUT_TOKENS = {
+    "generate-teams": (1500, 300, 8000),
+    "find-team-members": (500, 350, 4000),
+    "reanalyze-team": (1200, 80, 3000),
+}
+
+_TRIM_STATS = {}
+
+
+class PromptTooLarge(Exception):
+    """Even with every optional row dropped the prompt exceeds the budget."""
+
+    def __init__(self, tokens, budget):
+        super().__init__(f"Prompt of ~{tokens} tokens exceeds the budget of {budget}")
+        self.tokens = tokens
+        self.budget = budget
+
+
+class UsageCapExceeded(Exception):
+    def __init__(self, creator, used, cap):
+        super().__init__(f"Creator {creator} used {used} of {cap} tokens in the current window")
+        self.creator = creator
+        self.used = used
+        self.cap = cap
+
+
+def prompt_tokens(template, messages, model) -> int:
+    """Estimated input tokens of `messages` sent after `template`'s system prefix."""
+    text = "".join(message["content"] for message in messages if isinstance(message.get("content"), str))
+    return template.known_prefix_tokens(model) + estimate_tokens(text)
+
+
+def max_output_tokens(endpoint, people) -> int:
+    base, per_person, ceiling = OUTPUT_TOKENS[endpoint]
+    return min(ceiling, base + per_person * people)
+
+
+def fit_prompt(endpoint, template, model, budget, render, rows):
+    """
+    Renders the prompt with as many of `rows` (best-ranked first) as fit in
+    `budget` input tokens, dropping from the end. `render(rows)` returns the
+    messages and anything else the caller needs from that rendering.
+    Returns (messages, extra, kept_rows).
+    """
+    stats = _TRIM_STATS.setdefault(
+        endpoint, {"calls": 0, "trimmed_calls": 0, "dropped_rows": 0, "prompt_tokens": 0, "budget": budget}
+    )
+    stats["calls"] += 1
+    stats["budget"] = budget
+
+    messages, extra = render(rows)
+    tokens = prompt_tokens(template, messages, model)
+    if not budget or tokens <= budget:
+        stats["prompt_tokens"] += tokens
+        return messages, extra, rows
+
+    # Largest prefix of rows that fits; the full list is known not to
+    fitted = None
+    low, high = 0, len(rows) - 1
+    while low <= high:
+        count = (low + high) // 2
+        attempt_messages, attempt_extra = render(rows[:count])
+        attempt_tokens = prompt_tokens(template, attempt_messages, model)
+        if attempt_tokens <= budget:
+            fitted = (attempt_messages, attempt_extra, rows[:count], attempt_tokens)
+            low = count + 1
+        else:
+            high = count - 1
+    if fitted is None:
+        raise PromptTooLarge(tokens, budget)
+
+    messages, extra, kept, tokens = fitted
+    stats["trimmed_calls"] += 1
+    stats["dropped_rows"] += len(rows) - len(kept)
+    stats["prompt_tokens"] += tokens
+    return messages, extra, kept
+
+
+def get_trim_stats():
+    return {
+        endpoint: {
+            **stats,
+            "avg_prompt_tokens": stats["prompt_tokens"] / stats["calls"] if stats["calls"] else 0.0,
+        }
+        for endpoint, stats in _TRIM_STATS.items()
+    }
+
+
+class UsageLedger:
+    """
+    Token usage per endpoint and per creator. `cap_tokens` (input plus
+    output tokens per creator and window) of 0 disables the cap.
+    """
+
+    FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+    def __init__(self, cap_tokens=0, window_s=86400.0):
+        self.cap_tokens = cap_tokens
+        self.window_s = window_s
+        self._endpoints = {}
+        self._creators = {}
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(cap_tokens=settings.llm_creator_token_cap, window_s=settings.llm_usage_window_s)
+
+    @classmethod
+    def _empty(cls):
+        return {"calls": 0, **{field: 0 for field in cls.FIELDS}}
+
+    def _creator_entry(self, creator):
+        now = time.monotonic()
+        entry = self._creators.get(creator)
+        if entry is None or now - entry["window_started"] >= self.window_s:
+            entry = {"window_started": now, "window": self._empty(), "total": (entry or {}).get("total") or self._empty()}
+            self._creators[creator] = entry
+        return entry
+
+    @staticmethod
+    def _spent(usage) -> int:
+        return usage["input_tokens"] + usage["output_tokens"] + usage["cache_creation_input_tokens"]
+
+    def check(self, creator):
+        """Raises UsageCapExceeded when `creator` has no tokens left in this window."""
+        if not self.cap_tokens or creator is None:
+            return
+        used = self._spent(self._creator_entry(creator)["window"])
+        if used >= self.cap_tokens:
+            self.rejected += 1
+            raise UsageCapExceeded(creator, used, self.cap_tokens)
+
+    def record(self, endpoint, creator, usage):
+        if usage is None:
+            return
+        values = {field: getattr(usage, field, None) or 0 for field in self.FIELDS}
+        targets = [self._endpoints.setdefault(endpoint, self._empty())]
+        if creator is not None:
+            entry = self._creator_entry(creator)
+            targets += [entry["window"], entry["total"]]
+        for target in targets:
+            target["calls"] += 1
+            for field, value in values.items():
+                target[field] += value
+
+    def get_stats(self):
+        now = time.monotonic()
+        return {
+            "cap_tokens": self.cap_tokens,
+            "window_s": self.window_s,
+            "rejected": self.rejected,
+            "endpoints": {endpoint: dict(usage) for endpoint, usage in self._endpoints.items()},
+            "creators": {
+                creator: {
+                    "window": dict(entry["window"]) if now - entry["window_started"] < self.window_s else self._empty(),
+                    "total": dict(entry["total"]),
+                }
+                for creator, entry in self._creators.items()
+            },
+            "trimming": get_trim_stats(),
+        }